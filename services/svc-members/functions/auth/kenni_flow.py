@@ -290,7 +290,9 @@ def handleKenniAuth_handler(req: https_fn.Request) -> https_fn.Response:
 
             # Update last login and sync email/phone from Kenni.is
             update_data = {
-                'lastLogin': firestore.SERVER_TIMESTAMP
+                'lastLogin': firestore.SERVER_TIMESTAMP,
+                # Written with lastLogin so the login audit can filter on it
+                'loginStatus': 'success'
             }
             if email:
                 update_data['email'] = email
@@ -298,6 +300,9 @@ def handleKenniAuth_handler(req: https_fn.Request) -> https_fn.Response:
                 update_data['phoneNumber'] = normalized_phone_num
             if full_name:
                 update_data['fullName'] = full_name
+                # Lowercased list name so admin lists can be ordered server-side
+                existing_display_name = user_doc.to_dict().get('displayName')
+                update_data['displayNameLower'] = (existing_display_name or full_name).lower()
             # Store user agent for login audit
             user_agent = req.headers.get('User-Agent')
             if user_agent:
@@ -317,6 +322,7 @@ def handleKenniAuth_handler(req: https_fn.Request) -> https_fn.Response:
                 user_agent = req.headers.get('User-Agent')
                 user_profile_data = {
                     'fullName': full_name,
+                    'displayNameLower': (full_name or '').lower(),
                     'kennitala': normalized_kennitala,
                     'email': email,
                     'phoneNumber': normalized_phone_num,
@@ -324,6 +330,7 @@ def handleKenniAuth_handler(req: https_fn.Request) -> https_fn.Response:
                     'isMember': False,  # Will be verified separately
                     'createdAt': firestore.SERVER_TIMESTAMP,
                     'lastLogin': firestore.SERVER_TIMESTAMP,
+                    'loginStatus': 'success',
                     'lastUserAgent': user_agent[:500] if user_agent else None
                 }
                 db.collection('users').document(auth_uid).set(user_profile_data)
@@ -18,7 +18,7 @@ Usage:
 """
 
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
 from db import execute_query
 
 logger = logging.getLogger(__name__)
@@ -108,6 +108,7 @@ def get_member_by_django_id(django_id: int) -> Optional[Dict[str, Any]]:
             c.email_marketing,
             c.email_marketing_updated_at,
             c.profile_image_url,
+            c.firebase_uid,
             ci.email,
             ci.phone
         FROM membership_comrade c
@@ -123,6 +124,7 @@ def get_member_by_django_id(django_id: int) -> Optional[Dict[str, Any]]:
         'id': result['id'],
         'django_id': result['id'],
         'kennitala': result['kennitala'],
+        'firebase_uid': result['firebase_uid'],
         'profile': {
             'name': result['name'],
             'email': result['email'],
@@ -476,6 +478,74 @@ def get_deleted_members(limit: int = 50) -> List[Dict[str, Any]]:
     ]
 
 
+def iter_deleted_members(
+    limit: int = 1000,
+    batch_size: int = 100,
+    include_kennitala: bool = False
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield soft-deleted members in batches, paging through Cloud SQL by id.
+
+    Used by purge so work on the first batch overlaps with fetching the next,
+    and only one batch of rows is held at a time. Keyset pagination (id > last)
+    stays correct while earlier batches are being deleted.
+
+    Args:
+        limit: Maximum number of members in total
+        batch_size: Rows per batch
+        include_kennitala: Also return the full kennitala (needed to find the
+            Firebase user of members without a stored firebase_uid). Never
+            send this to clients.
+
+    Yields:
+        Lists of dicts with id, name, kennitala_masked, firebase_uid,
+        deleted_at (and kennitala if include_kennitala is set)
+    """
+    # Only read the raw kennitala when the caller needs it
+    kennitala_column = "c.ssn as kennitala," if include_kennitala else ""
+    query = f"""
+        SELECT
+            c.id,
+            c.name,
+            {kennitala_column}
+            CONCAT(LEFT(c.ssn, 6), '****') as kennitala_masked,
+            c.firebase_uid,
+            c.deleted_at
+        FROM membership_comrade c
+        WHERE c.deleted_at IS NOT NULL
+          AND c.ssn NOT LIKE '9999%%'
+          AND c.id > %s
+        ORDER BY c.id
+        LIMIT %s
+    """
+
+    last_id = 0
+    remaining = limit
+    while remaining > 0:
+        rows = execute_query(query, params=(last_id, min(batch_size, remaining)))
+        if not rows:
+            return
+
+        batch = []
+        for row in rows:
+            member = {
+                'id': row['id'],
+                'name': row['name'],
+                'kennitala_masked': row['kennitala_masked'],
+                'firebase_uid': row['firebase_uid'],
+                'deleted_at': row['deleted_at'].isoformat() if row['deleted_at'] else None
+            }
+            if include_kennitala:
+                member['kennitala'] = row['kennitala']
+            batch.append(member)
+        yield batch
+
+        last_id = rows[-1]['id']
+        remaining -= len(rows)
+        if len(rows) < batch_size:
+            return
+
+
 def get_member_by_email(email: str) -> Optional[Dict[str, Any]]:
     """
     Get a member by email address.
@@ -616,6 +686,72 @@ def update_sms_marketing(member_id: int, sms_marketing: bool) -> bool:
         return False
 
 
+# Tables cleared before membership_comrade on hard delete, in foreign key
+# order. Django's ON DELETE CASCADE is ORM-level only, so raw SQL needs an
+# explicit statement per table. Each statement takes the member ID array as
+# its only parameter.
+_HARD_DELETE_STEPS = [
+    ("membership_contactinfo", [
+        "DELETE FROM membership_contactinfo WHERE comrade_id = ANY(%s)",
+    ]),
+    ("membership_newlocaladdress", [
+        """WITH removed AS (
+               DELETE FROM membership_newlocaladdress WHERE comrade_id = ANY(%s)
+               RETURNING newcomradeaddress_ptr_id)
+           DELETE FROM membership_newcomradeaddress
+           WHERE id IN (SELECT newcomradeaddress_ptr_id FROM removed)""",
+    ]),
+    ("billing_membershipfee", [
+        "DELETE FROM billing_membershipfee WHERE comrade_id = ANY(%s)",
+    ]),
+    ("cells_cell_coordinators", [
+        "DELETE FROM cells_cell_coordinators WHERE comrade_id = ANY(%s)",
+    ]),
+    ("cells_cellgroup_coordinators", [
+        "DELETE FROM cells_cellgroup_coordinators WHERE comrade_id = ANY(%s)",
+    ]),
+    ("groups_comradegroupmembership", [
+        "DELETE FROM groups_comradegroupmembership WHERE comrade_id = ANY(%s)",
+    ]),
+    ("communication_sentemail", [
+        "DELETE FROM communication_sentemail WHERE comrade_id = ANY(%s)",
+    ]),
+    ("membership_unionmembership", [
+        "DELETE FROM membership_unionmembership WHERE comrade_id = ANY(%s)",
+    ]),
+    ("membership_comradetitle", [
+        "DELETE FROM membership_comradetitle WHERE comrade_id = ANY(%s)",
+    ]),
+    ("membership_activation", [
+        "DELETE FROM membership_activation WHERE comrade_id = ANY(%s)",
+    ]),
+    ("membership_newforeignaddress", [
+        """WITH removed AS (
+               DELETE FROM membership_newforeignaddress WHERE comrade_id = ANY(%s)
+               RETURNING newcomradeaddress_ptr_id)
+           DELETE FROM membership_newcomradeaddress
+           WHERE id IN (SELECT newcomradeaddress_ptr_id FROM removed)""",
+    ]),
+    ("communication_conversation", [
+        "UPDATE communication_conversation SET done_by_id = NULL WHERE done_by_id = ANY(%s)",
+        "DELETE FROM communication_conversation WHERE comrade_id = ANY(%s)",
+    ]),
+    ("issues_invitation", [
+        "DELETE FROM issues_invitation WHERE comrade_id = ANY(%s)",
+    ]),
+    ("issues_unabletoattend", [
+        "DELETE FROM issues_unabletoattend WHERE comrade_id = ANY(%s)",
+    ]),
+    ("groups_eventinvitation", [
+        "UPDATE groups_eventinvitation SET invited_by_id = NULL WHERE invited_by_id = ANY(%s)",
+        "DELETE FROM groups_eventinvitation WHERE comrade_id = ANY(%s)",
+    ]),
+    ("groups_post", [
+        "DELETE FROM groups_post WHERE author_id = ANY(%s)",
+    ]),
+]
+
+
 def hard_delete_member_sql(member_id: int) -> Dict[str, Any]:
     """
     Permanently delete a member from Cloud SQL.
@@ -623,25 +759,9 @@ def hard_delete_member_sql(member_id: int) -> Dict[str, Any]:
     This is a DANGEROUS operation that removes all member data from the database.
     Only soft-deleted members should be hard deleted.
 
-    Deletes from tables in order (respecting foreign key constraints):
-    1. membership_contactinfo (contact details)
-    2. membership_newlocaladdress / membership_newcomradeaddress (local addresses)
-    3. billing_membershipfee (fee records)
-    4. cells_cell_coordinators / cells_cellgroup_coordinators (if coordinator)
-    5. groups_comradegroupmembership (group memberships)
-    6. communication_sentemail (sent email records)
-    7. membership_unionmembership (union memberships)
-    8. membership_comradetitle (titles)
-    9. membership_activation (activation records)
-    10. membership_newforeignaddress (foreign addresses)
-    11. communication_conversation (conversations - nullify done_by, delete as subject)
-    12. issues_invitation (issue invitations)
-    13. issues_unabletoattend (unable to attend records)
-    14. groups_eventinvitation (event invitations - nullify invited_by, delete as invitee)
-    15. groups_post (posts by member)
-    16. membership_comrade (main member record)
-
-    Note: Django's ON DELETE CASCADE is ORM-level only, raw SQL needs explicit DELETE.
+    Runs hard_delete_members_sql for a single member, so the tables in
+    _HARD_DELETE_STEPS are cleared in foreign key order before the
+    membership_comrade row is removed.
 
     Args:
         member_id: Django database ID of the member
@@ -649,258 +769,100 @@ def hard_delete_member_sql(member_id: int) -> Dict[str, Any]:
     Returns:
         Dict with success status and deleted table counts
     """
-    from db import execute_query, execute_update
-
-    deleted_tables = []
-    errors = []
-
-    try:
-        # 1. Delete contact info
-        try:
-            execute_update(
-                "DELETE FROM membership_contactinfo WHERE comrade_id = %s",
-                params=(member_id,)
-            )
-            deleted_tables.append("membership_contactinfo")
-        except Exception as e:
-            errors.append(f"membership_contactinfo: {str(e)}")
-
-        # 2. Delete addresses (need to delete local addresses first, then base)
-        try:
-            # Get address IDs first (use execute_query for SELECT)
-            addr_ids = execute_query(
-                """SELECT newcomradeaddress_ptr_id FROM membership_newlocaladdress
-                   WHERE comrade_id = %s""",
-                params=(member_id,)
-            )
-            addr_id_list = [row['newcomradeaddress_ptr_id'] for row in (addr_ids or [])]
-
-            # Delete local addresses
-            execute_update(
-                "DELETE FROM membership_newlocaladdress WHERE comrade_id = %s",
-                params=(member_id,)
-            )
-            deleted_tables.append("membership_newlocaladdress")
-
-            # Delete base address records
-            if addr_id_list:
-                placeholders = ", ".join(["%s"] * len(addr_id_list))
-                execute_update(
-                    f"DELETE FROM membership_newcomradeaddress WHERE id IN ({placeholders})",
-                    params=tuple(addr_id_list)
-                )
-                deleted_tables.append("membership_newcomradeaddress")
-        except Exception as e:
-            errors.append(f"addresses: {str(e)}")
-
-        # 3. Delete billing/fee records
-        try:
-            execute_update(
-                "DELETE FROM billing_membershipfee WHERE comrade_id = %s",
-                params=(member_id,)
-            )
-            deleted_tables.append("billing_membershipfee")
-        except Exception as e:
-            logger.warning(f"Could not delete from billing_membershipfee: {e}")
-            errors.append(f"billing_membershipfee: {str(e)}")
+    member_id = int(member_id)
+    return hard_delete_members_sql([member_id])[member_id]
 
-        # 4. Delete cell coordinator records (if any)
-        try:
-            execute_update(
-                "DELETE FROM cells_cell_coordinators WHERE comrade_id = %s",
-                params=(member_id,)
-            )
-            deleted_tables.append("cells_cell_coordinators")
-        except Exception as e:
-            logger.warning(f"Could not delete from cells_cell_coordinators: {e}")
-            errors.append(f"cells_cell_coordinators: {str(e)}")
 
-        try:
-            execute_update(
-                "DELETE FROM cells_cellgroup_coordinators WHERE comrade_id = %s",
-                params=(member_id,)
-            )
-            deleted_tables.append("cells_cellgroup_coordinators")
-        except Exception as e:
-            logger.warning(f"Could not delete from cells_cellgroup_coordinators: {e}")
-            errors.append(f"cells_cellgroup_coordinators: {str(e)}")
+def hard_delete_members_sql(member_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    """
+    Permanently delete a batch of members from Cloud SQL in one transaction.
 
-        # 5. Delete group memberships (if any)
-        try:
-            execute_update(
-                "DELETE FROM groups_comradegroupmembership WHERE comrade_id = %s",
-                params=(member_id,)
-            )
-            deleted_tables.append("groups_comradegroupmembership")
-        except Exception as e:
-            logger.warning(f"Could not delete from groups_comradegroupmembership: {e}")
-            errors.append(f"groups_comradegroupmembership: {str(e)}")
+    Every table in _HARD_DELETE_STEPS is cleared with a single `= ANY(%s)`
+    statement for the whole batch, over one connection and one commit. Each
+    step runs under a savepoint so a failing table is recorded and skipped.
 
-        # 6. Delete sent email records (if any)
-        try:
-            execute_update(
-                "DELETE FROM communication_sentemail WHERE comrade_id = %s",
-                params=(member_id,)
-            )
-            deleted_tables.append("communication_sentemail")
-        except Exception as e:
-            logger.warning(f"Could not delete from communication_sentemail: {e}")
-            errors.append(f"communication_sentemail: {str(e)}")
+    Address child rows and their membership_newcomradeaddress base rows are
+    removed in one statement, so the base delete needs no prior SELECT.
 
-        # 7. Delete union memberships
-        try:
-            execute_update(
-                "DELETE FROM membership_unionmembership WHERE comrade_id = %s",
-                params=(member_id,)
-            )
-            deleted_tables.append("membership_unionmembership")
-        except Exception as e:
-            logger.warning(f"Could not delete from membership_unionmembership: {e}")
-            errors.append(f"membership_unionmembership: {str(e)}")
+    If the batch transaction fails (e.g. one member's row violates a foreign
+    key), it is rolled back and each member is retried in its own
+    transaction, so a bad row only fails that member.
 
-        # 8. Delete comrade titles
-        try:
-            execute_update(
-                "DELETE FROM membership_comradetitle WHERE comrade_id = %s",
-                params=(member_id,)
-            )
-            deleted_tables.append("membership_comradetitle")
-        except Exception as e:
-            logger.warning(f"Could not delete from membership_comradetitle: {e}")
-            errors.append(f"membership_comradetitle: {str(e)}")
+    Args:
+        member_ids: Django database IDs of the members
 
-        # 9. Delete activation records
-        try:
-            execute_update(
-                "DELETE FROM membership_activation WHERE comrade_id = %s",
-                params=(member_id,)
-            )
-            deleted_tables.append("membership_activation")
-        except Exception as e:
-            logger.warning(f"Could not delete from membership_activation: {e}")
-            errors.append(f"membership_activation: {str(e)}")
+    Returns:
+        Dict mapping each member ID to a result dict
+        (success, deleted_tables, errors)
+    """
+    from db import get_connection
 
-        # 10. Delete foreign addresses
-        try:
-            # Get foreign address IDs first
-            foreign_addr_ids = execute_query(
-                """SELECT newcomradeaddress_ptr_id FROM membership_newforeignaddress
-                   WHERE comrade_id = %s""",
-                params=(member_id,)
-            )
-            foreign_addr_id_list = [row['newcomradeaddress_ptr_id'] for row in (foreign_addr_ids or [])]
+    ids = [int(member_id) for member_id in member_ids]
+    if not ids:
+        return {}
 
-            execute_update(
-                "DELETE FROM membership_newforeignaddress WHERE comrade_id = %s",
-                params=(member_id,)
-            )
-            deleted_tables.append("membership_newforeignaddress")
+    deleted_tables = []
+    errors = []
 
-            # Delete base address records for foreign addresses
-            if foreign_addr_id_list:
-                placeholders = ", ".join(["%s"] * len(foreign_addr_id_list))
-                execute_update(
-                    f"DELETE FROM membership_newcomradeaddress WHERE id IN ({placeholders})",
-                    params=tuple(foreign_addr_id_list)
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                for table, statements in _HARD_DELETE_STEPS:
+                    cursor.execute("SAVEPOINT hard_delete_step")
+                    try:
+                        for statement in statements:
+                            cursor.execute(statement, (ids,))
+                        cursor.execute("RELEASE SAVEPOINT hard_delete_step")
+                        deleted_tables.append(table)
+                    except Exception as e:
+                        cursor.execute("ROLLBACK TO SAVEPOINT hard_delete_step")
+                        logger.warning(f"Could not delete from {table}: {e}")
+                        errors.append(f"{table}: {str(e)}")
+
+                # Finally, delete the member records
+                cursor.execute(
+                    "DELETE FROM membership_comrade WHERE id = ANY(%s) RETURNING id",
+                    (ids,)
                 )
-        except Exception as e:
-            logger.warning(f"Could not delete from membership_newforeignaddress: {e}")
-            errors.append(f"membership_newforeignaddress: {str(e)}")
-
-        # 11. Delete conversations (both as subject and done_by)
-        try:
-            # First nullify done_by references
-            execute_update(
-                "UPDATE communication_conversation SET done_by_id = NULL WHERE done_by_id = %s",
-                params=(member_id,)
-            )
-            # Then delete conversations where member is subject
-            execute_update(
-                "DELETE FROM communication_conversation WHERE comrade_id = %s",
-                params=(member_id,)
-            )
-            deleted_tables.append("communication_conversation")
-        except Exception as e:
-            logger.warning(f"Could not delete from communication_conversation: {e}")
-            errors.append(f"communication_conversation: {str(e)}")
-
-        # 12. Delete issues invitations
-        try:
-            execute_update(
-                "DELETE FROM issues_invitation WHERE comrade_id = %s",
-                params=(member_id,)
-            )
-            deleted_tables.append("issues_invitation")
-        except Exception as e:
-            logger.warning(f"Could not delete from issues_invitation: {e}")
-            errors.append(f"issues_invitation: {str(e)}")
-
-        # 13. Delete unable to attend records
-        try:
-            execute_update(
-                "DELETE FROM issues_unabletoattend WHERE comrade_id = %s",
-                params=(member_id,)
-            )
-            deleted_tables.append("issues_unabletoattend")
-        except Exception as e:
-            logger.warning(f"Could not delete from issues_unabletoattend: {e}")
-            errors.append(f"issues_unabletoattend: {str(e)}")
-
-        # 14. Delete event invitations (both as invitee and inviter)
-        try:
-            # First nullify invited_by references
-            execute_update(
-                "UPDATE groups_eventinvitation SET invited_by_id = NULL WHERE invited_by_id = %s",
-                params=(member_id,)
-            )
-            # Then delete invitations where member is invitee
-            execute_update(
-                "DELETE FROM groups_eventinvitation WHERE comrade_id = %s",
-                params=(member_id,)
-            )
-            deleted_tables.append("groups_eventinvitation")
-        except Exception as e:
-            logger.warning(f"Could not delete from groups_eventinvitation: {e}")
-            errors.append(f"groups_eventinvitation: {str(e)}")
-
-        # 15. Delete posts
-        try:
-            execute_update(
-                "DELETE FROM groups_post WHERE author_id = %s",
-                params=(member_id,)
-            )
-            deleted_tables.append("groups_post")
-        except Exception as e:
-            logger.warning(f"Could not delete from groups_post: {e}")
-            errors.append(f"groups_post: {str(e)}")
-
-        # 16. Finally, delete the member record
-        try:
-            rows_deleted = execute_update(
-                "DELETE FROM membership_comrade WHERE id = %s",
-                params=(member_id,)
-            )
-            if rows_deleted > 0:
-                deleted_tables.append("membership_comrade")
-            else:
-                errors.append("membership_comrade: No rows deleted (record not found)")
-        except Exception as e:
-            errors.append(f"membership_comrade: {str(e)}")
-
-        success = "membership_comrade" in deleted_tables
-        return {
-            "success": success,
-            "deleted_tables": deleted_tables,
-            "errors": errors if errors else None
-        }
+                deleted_ids = {row[0] for row in cursor.fetchall()}
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.close()
 
     except Exception as e:
-        logger.error(f"Hard delete failed for member {member_id}: {e}")
-        return {
-            "success": False,
-            "deleted_tables": deleted_tables,
-            "errors": [str(e)]
-        }
+        if len(ids) == 1:
+            logger.error(f"Hard delete failed for member {ids[0]}: {e}")
+            return {ids[0]: {
+                "success": False,
+                "deleted_tables": [],
+                "errors": [str(e)]
+            }}
+        logger.warning(f"Batch hard delete failed for {len(ids)} members, "
+                       f"retrying one at a time: {e}")
+        results = {}
+        for member_id in ids:
+            results.update(hard_delete_members_sql([member_id]))
+        return results
+
+    results = {}
+    for member_id in ids:
+        if member_id in deleted_ids:
+            results[member_id] = {
+                "success": True,
+                "deleted_tables": deleted_tables + ["membership_comrade"],
+                "errors": errors if errors else None
+            }
+        else:
+            results[member_id] = {
+                "success": False,
+                "deleted_tables": deleted_tables,
+                "errors": errors + ["membership_comrade: No rows deleted (record not found)"]
+            }
+    return results
 
 
 def anonymize_member_sql(member_id: int, anon_id: str) -> Dict[str, Any]:
@@ -10,21 +10,40 @@ Functions for superuser console operations:
 All functions require superuser role.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 from firebase_admin import auth, firestore
+from firebase_admin import exceptions as firebase_exceptions
 from firebase_functions import https_fn
+import google.auth
+from google.auth.transport.requests import Request
 from util_logging import log_json
-from shared.rate_limit import check_uid_rate_limit
+from shared.rate_limit import (
+    check_uid_rate_limit_with_retry,
+    acquire_concurrency_slot,
+    release_concurrency_slot
+)
 from db_members import (
     get_member_by_django_id,
     get_deleted_member_count,
     get_deleted_members,
+    iter_deleted_members,
     hard_delete_member_sql,
+    hard_delete_members_sql,
     anonymize_member_sql
 )
+import functools
+import json
+import math
 import requests
+from requests.adapters import HTTPAdapter
+import threading
 import time
 import re
+import secrets
 
 # Import Cloud Logging lazily to avoid import issues in local dev
 _logging_client = None
@@ -41,94 +60,125 @@ def get_logging_client():
             _logging_client = None
     return _logging_client
 
+# Firestore client, created on first use
+_db = None
+
+def get_db():
+    """Get Firestore client (lazy initialization)."""
+    global _db
+    if _db is None:
+        _db = firestore.client()
+    return _db
+
 # Service URLs for health checks
-# Services with URLs get actively checked
-# Services without URLs are listed but marked as "no health endpoint"
+# Cloud Run services are actively checked via their health URL
 
 # Core GCP services with health endpoints
-CLOUD_RUN_SERVICES = [
-    {
-        "id": "elections-service",
-        "name": "Kosningaþjónusta",
-        "url": "https://elections-service-521240388393.europe-west1.run.app/health"
-    },
-    {
-        "id": "events-service",
-        "name": "Viðburðaþjónusta",
-        "url": "https://events-service-521240388393.europe-west1.run.app/health"
-    },
-    {
-        "id": "healthz",
-        "name": "Kenni.is Health Check",
-        "url": "https://healthz-521240388393.europe-west2.run.app/"
-    },
-    {
-        "id": "django-socialism",
-        "name": "Django Admin (GCP)",
-        "url": "https://starf.sosialistaflokkurinn.is/felagar/api/"
-    },
-    {
-        "id": "xj-next",
-        "name": "Vefsíða (xj-next)",
-        "url": "https://xj-next-521240388393.europe-west1.run.app/"
-    },
-    {
-        "id": "xj-strapi",
-        "name": "Strapi CMS",
-        "url": "https://xj-strapi-521240388393.europe-west1.run.app/_health"
-    },
-    {
-        "id": "warmup",
-        "name": "Warmup þjónusta",
-        "url": "https://warmup-521240388393.europe-west1.run.app/health"
-    },
-    {
-        "id": "xj-site",
-        "name": "Vefsíða (xj-site)",
-        "url": "https://xj-site-521240388393.europe-west1.run.app/"
-    },
-    {
-        "id": "svc-members-health",
-        "name": "Firebase Functions (svc-members)",
-        "url": "https://svcmembershealth-521240388393.europe-west2.run.app/"
-    },
-]
+class Service(NamedTuple):
+    """A Cloud Run service with a health endpoint."""
+    id: str
+    name: str
+    url: str
+
+
+CLOUD_RUN_SERVICES = (
+    Service("elections-service", "Kosningaþjónusta",
+            "https://elections-service-521240388393.europe-west1.run.app/health"),
+    Service("events-service", "Viðburðaþjónusta",
+            "https://events-service-521240388393.europe-west1.run.app/health"),
+    Service("healthz", "Kenni.is Health Check",
+            "https://healthz-521240388393.europe-west2.run.app/"),
+    Service("django-socialism", "Django Admin (GCP)",
+            "https://starf.sosialistaflokkurinn.is/felagar/api/"),
+    Service("xj-next", "Vefsíða (xj-next)",
+            "https://xj-next-521240388393.europe-west1.run.app/"),
+    Service("xj-strapi", "Strapi CMS",
+            "https://xj-strapi-521240388393.europe-west1.run.app/_health"),
+    Service("warmup", "Warmup þjónusta",
+            "https://warmup-521240388393.europe-west1.run.app/health"),
+    Service("xj-site", "Vefsíða (xj-site)",
+            "https://xj-site-521240388393.europe-west1.run.app/"),
+    Service("svc-members-health", "Firebase Functions (svc-members)",
+            "https://svcmembershealth-521240388393.europe-west2.run.app/"),
+)
 
 # Base URL for Firebase Callable Functions
 FUNCTIONS_BASE_URL = "https://europe-west2-ekklesia-prod-10-2025.cloudfunctions.net"
 
+# Shared HTTP session for health probes. Warm instances keep connections
+# (and TLS sessions) to the probed hosts alive between health checks.
+# Retries are disabled so a failing probe never exceeds its own timeout.
+_http_session = requests.Session()
+_http_session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=64, max_retries=0))
+_http_session.headers.update({"User-Agent": "Ekklesia-HealthCheck/1.0"})
+
+# Callable probes normally send an OPTIONS preflight. The functions framework
+# answers it inside the function's container, so a 2xx proves an instance can
+# start and serve HTTP - but not that the handler itself works. 400/405 still
+# come from the container. 401/403 usually come from Google's front end
+# (function not invocable by clients), so they are reported as degraded.
+CALLABLE_PROBE_TIMEOUT = 2
+CALLABLE_HEALTHY_STATUSES = (200, 204, 400, 405)
+
+# Every Nth health check run calls the lookup functions for real (POST
+# {"data": {}}); they return static data and need no auth, so only 200 is
+# healthy. The run counter is per instance.
+CALLABLE_FULL_PROBE_EVERY = 5
+CALLABLE_FULL_PROBE_TIMEOUT = 10
+_health_run_count = 0
+_health_run_count_lock = threading.Lock()
+
+# Concurrent outbound probes in check_system_health_handler
+HEALTH_PROBE_MAX_WORKERS = 32
+
+# Probes only look at the status code. Bodies up to this size are drained so
+# the keep-alive connection goes back to the pool; larger or unsized bodies
+# are not downloaded and the connection is dropped instead.
+PROBE_DRAIN_MAX_BYTES = 16 * 1024
+
+
+def _release_probe_response(response: requests.Response) -> None:
+    """Release a streamed probe response without downloading large bodies."""
+    try:
+        length = int(response.headers.get("Content-Length", ""))
+    except ValueError:
+        length = None
+    if length is not None and length <= PROBE_DRAIN_MAX_BYTES:
+        response.content  # Reads the (small) body so the connection is reusable
+    response.close()
+
 # Firebase Functions - Member Operations (Cloud Run backed, no /health endpoint)
-MEMBER_FUNCTIONS = [
+MEMBER_FUNCTIONS = (
     {"id": "handlekenniauth", "name": "Kenni.is Auth"},
     {"id": "verifymembership", "name": "Staðfesting félagsaðildar"},
     {"id": "updatememberprofile", "name": "Prófíluppfærsla"},
     {"id": "softdeleteself", "name": "Afskrá sjálfan sig"},
     {"id": "reactivateself", "name": "Endurvirkja aðild"},
-]
+)
 
 # Firebase Functions - Address Validation
-ADDRESS_FUNCTIONS = [
+ADDRESS_FUNCTIONS = (
     {"id": "search-addresses", "name": "Heimilisfangaleit"},
     {"id": "validate-address", "name": "Staðfesting heimilisfangs"},
     {"id": "validate-postal-code", "name": "Staðfesting póstnúmers"},
-]
+)
 
 # Firebase Functions - Lookup (safe to ping - return static data)
-LOOKUP_FUNCTIONS = [
+LOOKUP_FUNCTIONS = (
     {"id": "list-unions", "name": "Stéttarfélög", "function_name": "list_unions"},
     {"id": "list-job-titles", "name": "Starfsheiti", "function_name": "list_job_titles"},
     {"id": "list-countries", "name": "Lönd", "function_name": "list_countries"},
     {"id": "list-postal-codes", "name": "Póstnúmer", "function_name": "list_postal_codes"},
     {"id": "get-cells-by-postal-code", "name": "Sellur eftir póstnúmeri", "function_name": "get_cells_by_postal_code"},
-]
+)
 
 # Firebase Functions - Registration
-REGISTRATION_FUNCTIONS = [
+REGISTRATION_FUNCTIONS = (
     {"id": "register-member", "name": "Skráning félaga"},
-]
+)
 
 # Firebase Functions - Superuser Operations
-SUPERUSER_FUNCTIONS = [
+SUPERUSER_FUNCTIONS = (
     {"id": "checksystemhealth", "name": "Staða kerfis"},
     {"id": "setuserrole", "name": "Setja hlutverk notanda"},
     {"id": "getuserrole", "name": "Sækja hlutverk notanda"},
@@ -140,10 +190,10 @@ SUPERUSER_FUNCTIONS = [
     {"id": "listelevatedusers", "name": "Listi yfir stjórnendur"},
     {"id": "purgedeleted", "name": "Eyða merktum félögum"},
     {"id": "getdeletedcounts", "name": "Fjöldi eyddra gagna"},
-]
+)
 
 # Firebase Functions - Email Operations (Issue #323)
-EMAIL_FUNCTIONS = [
+EMAIL_FUNCTIONS = (
     {"id": "listemailtemplates", "name": "Lista póstsniðmát"},
     {"id": "getemailtemplate", "name": "Sækja póstsniðmát"},
     {"id": "saveemailtemplate", "name": "Vista póstsniðmát"},
@@ -159,31 +209,65 @@ EMAIL_FUNCTIONS = [
     {"id": "unsubscribe", "name": "Afskráning af póstlista"},
     {"id": "getmunicipalities", "name": "Sækja sveitarfélög"},
     {"id": "previewrecipientcount", "name": "Forskoðun viðtakendafjölda"},
-]
+)
 
 # Firebase Functions - Heatmap/Analytics
-HEATMAP_FUNCTIONS = [
+HEATMAP_FUNCTIONS = (
     {"id": "compute-member-heatmap-stats", "name": "Reikna hitakortsgögn"},
     {"id": "get-member-heatmap-data", "name": "Sækja hitakortsgögn"},
-]
+)
 
 # Firebase Functions - Admin Member Operations
-ADMIN_MEMBER_FUNCTIONS = [
+ADMIN_MEMBER_FUNCTIONS = (
     {"id": "listmembers", "name": "Lista félaga"},
     {"id": "getmember", "name": "Sækja félaga"},
     {"id": "getmemberstats", "name": "Tölfræði félaga"},
     {"id": "getmemberself", "name": "Sækja eigin gögn"},
     {"id": "softdeleteadmin", "name": "Afskrá félaga (admin)"},
-]
+)
 
 # Combined list for backward compatibility
 FIREBASE_FUNCTIONS = (
-    MEMBER_FUNCTIONS +
-    ADDRESS_FUNCTIONS +
-    SUPERUSER_FUNCTIONS +
-    EMAIL_FUNCTIONS +
-    HEATMAP_FUNCTIONS +
-    ADMIN_MEMBER_FUNCTIONS
+    *MEMBER_FUNCTIONS,
+    *ADDRESS_FUNCTIONS,
+    *SUPERUSER_FUNCTIONS,
+    *EMAIL_FUNCTIONS,
+    *HEATMAP_FUNCTIONS,
+    *ADMIN_MEMBER_FUNCTIONS,
+)
+
+# Probe URLs never change at runtime, so build them once at import
+for _func in (*LOOKUP_FUNCTIONS, *REGISTRATION_FUNCTIONS, *FIREBASE_FUNCTIONS):
+    if "function_name" in _func:
+        _func["_probe_url"] = f"{FUNCTIONS_BASE_URL}/{_func['function_name']}"
+del _func
+
+# Firebase Functions by category, in display order
+_FUNCTION_CATEGORIES = (
+    (LOOKUP_FUNCTIONS, "lookup"),
+    (MEMBER_FUNCTIONS, "member"),
+    (ADDRESS_FUNCTIONS, "address"),
+    (REGISTRATION_FUNCTIONS, "registration"),
+    (SUPERUSER_FUNCTIONS, "superuser"),
+    (EMAIL_FUNCTIONS, "email"),
+    (HEATMAP_FUNCTIONS, "heatmap"),
+    (ADMIN_MEMBER_FUNCTIONS, "admin"),
+)
+
+# Functions without function_name can't be pinged safely, so their result
+# never changes - build it once instead of on every health check
+_AVAILABLE_FUNCTION_RESULTS = tuple(
+    {
+        "id": service["id"],
+        "name": service["name"],
+        "status": "available",
+        "message": "Tilbúið",
+        "responseTime": None,
+        "category": category
+    }
+    for func_list, category in _FUNCTION_CATEGORIES
+    for service in func_list
+    if "_probe_url" not in service
 )
 
 
@@ -207,34 +291,71 @@ def require_superuser(req: https_fn.CallableRequest) -> Dict[str, Any]:
         )
 
     # Check for superuser role in custom claims
-    # Support both 'role' (singular) and 'roles' (array) formats
+    # Support both 'roles' (array) and legacy 'role' (singular) formats.
+    # The scalar compare is cheapest, so it short-circuits the list scan.
     claims = req.auth.token or {}
-    roles = claims.get("roles", [])
     single_role = claims.get("role")
-
-    is_superuser = (
-        "superuser" in roles or
-        single_role == "superuser"
+    roles = claims.get("roles") or ()
+    if single_role == "superuser" or "superuser" in roles:
+        return claims
+
+    log_json("warning", "Unauthorized superuser access attempt",
+             uid=req.auth.uid,
+             roles=list(roles),
+             single_role=single_role,
+             attempted_action="superuser_function")
+    raise https_fn.HttpsError(
+        code=https_fn.FunctionsErrorCode.PERMISSION_DENIED,
+        message="Superuser role required"
     )
 
-    if not is_superuser:
-        log_json("warning", "Unauthorized superuser access attempt",
-                 uid=req.auth.uid,
-                 roles=roles,
-                 single_role=single_role,
-                 attempted_action="superuser_function")
-        raise https_fn.HttpsError(
-            code=https_fn.FunctionsErrorCode.PERMISSION_DENIED,
-            message="Superuser role required"
-        )
-
-    return claims
-
 
 # ==============================================================================
 # ROLE MANAGEMENT
 # ==============================================================================
 
+# Roles array stored for each assignable role.
+# Everyone keeps the 'member' base role; admin and superuser are added on top.
+ROLE_HIERARCHY = {
+    "member": ("member",),
+    "admin": ("member", "admin"),
+    "superuser": ("member", "superuser"),
+}
+
+# Short-lived cache of get_user_role responses keyed by target UID.
+# The role editor re-reads the same user repeatedly; set_user_role
+# invalidates the entry so staleness is bounded by the TTL.
+# Structure: { uid: (cached_at, response) }
+USER_ROLE_CACHE_TTL_SECONDS = 30
+_user_role_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+_user_role_cache_lock = threading.Lock()
+
+
+def _invalidate_user_role_cache(uid: str) -> None:
+    """Drop any cached get_user_role response for a UID."""
+    with _user_role_cache_lock:
+        _user_role_cache.pop(uid, None)
+
+
+# Cached (unpaged) list_elevated_users response. Role changes and member
+# deletions invalidate it; anything else is bounded by the TTL.
+# Structure: (cached_at, response)
+ELEVATED_USERS_CACHE_TTL_SECONDS = 60
+_elevated_users_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+_elevated_users_cache_lock = threading.Lock()
+
+
+def _invalidate_elevated_users_cache() -> None:
+    """Drop the cached list_elevated_users response."""
+    global _elevated_users_cache
+    with _elevated_users_cache_lock:
+        _elevated_users_cache = None
+
+
+# /users fields read by set_user_role_handler (projection)
+USER_ROLE_DOC_FIELDS = ["roles", "role", "displayName", "fullName", "displayNameLower"]
+
+
 def set_user_role_handler(req: https_fn.CallableRequest) -> Dict[str, Any]:
     """
     Set Firebase custom claims (role) for a user.
@@ -243,6 +364,11 @@ def set_user_role_handler(req: https_fn.CallableRequest) -> Dict[str, Any]:
         - target_uid: Firebase UID of user to modify
         - role: 'member', 'admin', or 'superuser'
 
+    Optional data:
+        - include_old_roles: Look up the target's current roles (default True).
+          Bulk provisioning can pass False to skip the Auth lookup; old_role
+          is then reported as "unknown".
+
     Returns:
         Success status with updated claims.
     """
@@ -250,17 +376,11 @@ def set_user_role_handler(req: https_fn.CallableRequest) -> Dict[str, Any]:
     require_superuser(req)
     caller_uid = req.auth.uid
 
-    # Security: Rate limit role changes (10 per 10 minutes)
-    if not check_uid_rate_limit(caller_uid, "set_role", max_attempts=10, window_minutes=10):
-        raise https_fn.HttpsError(
-            code=https_fn.FunctionsErrorCode.RESOURCE_EXHAUSTED,
-            message="Rate limit exceeded. Maximum 10 role changes per 10 minutes."
-        )
-
     # Validate input
     data = req.data or {}
     target_uid = data.get("target_uid")
     new_role = data.get("role")
+    include_old_roles = data.get("include_old_roles", True) is not False
 
     if not target_uid:
         raise https_fn.HttpsError(
@@ -268,7 +388,7 @@ def set_user_role_handler(req: https_fn.CallableRequest) -> Dict[str, Any]:
             message="target_uid is required"
         )
 
-    if new_role not in ["member", "admin", "superuser"]:
+    if not isinstance(new_role, str) or new_role not in ROLE_HIERARCHY:
         raise https_fn.HttpsError(
             code=https_fn.FunctionsErrorCode.INVALID_ARGUMENT,
             message="role must be 'member', 'admin', or 'superuser'"
@@ -281,50 +401,124 @@ def set_user_role_handler(req: https_fn.CallableRequest) -> Dict[str, Any]:
             message="Cannot demote yourself. Ask another superuser."
         )
 
+    # Security: Rate limit role changes (10 per 10 minutes)
+    allowed, retry_after = check_uid_rate_limit_with_retry(caller_uid, "set_role", max_attempts=10, window_minutes=10)
+    if not allowed:
+        raise https_fn.HttpsError(
+            code=https_fn.FunctionsErrorCode.RESOURCE_EXHAUSTED,
+            message="Rate limit exceeded. Maximum 10 role changes per 10 minutes.",
+            details={"retry_after_seconds": retry_after}
+        )
+
     try:
-        # Get target user info
-        target_user = auth.get_user(target_uid)
-        old_claims = target_user.custom_claims or {}
-        old_roles = old_claims.get("roles", ["member"])
-        old_role = old_claims.get("role", "member")  # Legacy field
+        # Get target user info (skipped on request; set_custom_user_claims
+        # still raises UserNotFoundError for unknown UIDs)
+        if include_old_roles:
+            target_user = auth.get_user(target_uid)
+            old_claims = target_user.custom_claims or {}
+            old_roles = old_claims.get("roles", ["member"])
+            old_role = old_claims.get("role", "member")  # Legacy field
+            target_email = target_user.email
+            target_name = target_user.display_name or target_user.email
+        else:
+            target_user = None
+            old_roles = None
+            old_role = "unknown"
+            target_email = None
+            target_name = None
 
         # Build new roles array - everyone keeps 'member' base role
-        # Roles hierarchy: member (base), admin, superuser
-        new_roles = ["member"]
-        if new_role == "admin":
-            new_roles.append("admin")
-        elif new_role == "superuser":
-            new_roles.append("superuser")
-        # If new_role == "member", just ['member']
-
-        # Set new custom claims (using 'roles' array as primary)
-        auth.set_custom_user_claims(target_uid, {"roles": new_roles})
-
-        # Log the action
-        log_json("info", "User role updated",
-                 action="set_user_role",
-                 caller_uid=caller_uid,
-                 target_uid=target_uid,
-                 target_email=target_user.email,
-                 old_roles=old_roles,
-                 new_roles=new_roles)
+        new_roles = list(ROLE_HIERARCHY[new_role])
 
-        # Update Firestore user document (roles array only, delete legacy 'role' string)
-        db = firestore.client()
+        db = get_db()
         user_ref = db.collection("users").document(target_uid)
-        user_ref.set({
+        user_doc = user_ref.get(field_paths=USER_ROLE_DOC_FIELDS).to_dict() or {}
+
+        # Rewriting matching claims would revoke the target's ID tokens for
+        # nothing, so they are only set when they differ. The /users document
+        # is compared separately: if it has drifted from the claims, running
+        # setUserRole again must still repair it.
+        claims_unchanged = (include_old_roles and "roles" in old_claims
+                            and "role" not in old_claims
+                            and set(old_claims["roles"]) == set(new_roles))
+        user_doc_unchanged = (set(user_doc.get("roles") or ()) == set(new_roles)
+                              and "role" not in user_doc
+                              and "displayNameLower" in user_doc)
+        if claims_unchanged and user_doc_unchanged:
+            log_json("info", "User role unchanged",
+                     action="set_user_role_noop",
+                     caller_uid=caller_uid,
+                     target_uid=target_uid,
+                     roles=new_roles)
+            return {
+                "success": True,
+                "unchanged": True,
+                "target_uid": target_uid,
+                "old_role": old_role,  # Keep for backwards compat
+                "new_role": new_role,  # Keep for backwards compat
+                "old_roles": old_roles,
+                "new_roles": new_roles,
+                "message": f"Role is already {new_role}"
+            }
+
+        if claims_unchanged:
+            log_json("info", "User role unchanged; repairing /users document",
+                     action="set_user_role_repair",
+                     caller_uid=caller_uid,
+                     target_uid=target_uid,
+                     roles=new_roles,
+                     user_doc_roles=user_doc.get("roles"))
+        else:
+            # Set new custom claims (using 'roles' array as primary)
+            auth.set_custom_user_claims(target_uid, {"roles": new_roles})
+            _invalidate_user_role_cache(target_uid)
+
+            # Log the action
+            log_json("info", "User role updated",
+                     action="set_user_role",
+                     caller_uid=caller_uid,
+                     target_uid=target_uid,
+                     target_email=target_email,
+                     old_roles=old_roles,
+                     new_roles=new_roles)
+
+        # Update Firestore user document (roles array only, delete legacy 'role' string)
+        user_update = {
             "roles": new_roles,
             "role": firestore.DELETE_FIELD,  # Remove legacy field
             "roleUpdatedAt": firestore.SERVER_TIMESTAMP,
             "roleUpdatedBy": caller_uid
-        }, merge=True)
+        }
+        # Every document with a role must be orderable by the paged
+        # listElevatedUsers query, including users who have never logged
+        # in. An existing sort name is kept; "" is a placeholder until a
+        # name is known.
+        if not user_doc.get("displayNameLower"):
+            name = (user_doc.get("displayName") or user_doc.get("fullName")
+                    or (target_user.display_name if target_user else None))
+            user_update["displayNameLower"] = (name or "").lower()
+        user_ref.set(user_update, merge=True)
+        _invalidate_elevated_users_cache()
+
+        if claims_unchanged:
+            return {
+                "success": True,
+                "unchanged": True,
+                "repaired": True,
+                "target_uid": target_uid,
+                "old_role": old_role,  # Keep for backwards compat
+                "new_role": new_role,  # Keep for backwards compat
+                "old_roles": old_roles,
+                "new_roles": new_roles,
+                "message": f"Role is already {new_role}; /users document repaired"
+            }
 
         # Store role change in history collection for the roles page
         caller_user = auth.get_user(caller_uid)
         db.collection("roleChanges").add({
             "targetUid": target_uid,
-            "targetName": target_user.display_name or target_user.email,
-            "targetEmail": target_user.email,
+            "targetName": target_name,
+            "targetEmail": target_email,
             "oldRole": old_role,
             "newRole": new_role,
             "changedBy": caller_uid,
@@ -381,6 +575,11 @@ def get_user_role_handler(req: https_fn.CallableRequest) -> Dict[str, Any]:
             message="target_uid is required"
         )
 
+    with _user_role_cache_lock:
+        cached = _user_role_cache.get(target_uid)
+    if cached and time.time() - cached[0] < USER_ROLE_CACHE_TTL_SECONDS:
+        return cached[1]
+
     try:
         # Get target user info
         target_user = auth.get_user(target_uid)
@@ -389,7 +588,7 @@ def get_user_role_handler(req: https_fn.CallableRequest) -> Dict[str, Any]:
         # Get roles from array (new format) with fallback
         roles = claims.get("roles", ["member"])
 
-        return {
+        result = {
             "uid": target_uid,
             "email": target_user.email,
             "displayName": target_user.display_name,
@@ -399,6 +598,11 @@ def get_user_role_handler(req: https_fn.CallableRequest) -> Dict[str, Any]:
             "lastSignIn": target_user.user_metadata.last_sign_in_timestamp
         }
 
+        with _user_role_cache_lock:
+            _user_role_cache[target_uid] = (time.time(), result)
+
+        return result
+
     except auth.UserNotFoundError:
         raise https_fn.HttpsError(
             code=https_fn.FunctionsErrorCode.NOT_FOUND,
@@ -427,7 +631,7 @@ def get_role_change_history_handler(req: https_fn.CallableRequest) -> Dict[str,
     result_limit = min(data.get("limit", 20), 50)
 
     try:
-        db = firestore.client()
+        db = get_db()
 
         changes_ref = db.collection("roleChanges")
         query = changes_ref.order_by(
@@ -467,185 +671,153 @@ def get_role_change_history_handler(req: https_fn.CallableRequest) -> Dict[str,
 # SYSTEM HEALTH
 # ==============================================================================
 
-def check_system_health_handler(req: https_fn.CallableRequest) -> Dict[str, Any]:
-    """
-    Check health of all services (GCP, external, Firebase functions).
-    Bypasses CORS issues by making server-side requests.
+# Last health check result, shared by dashboards polling within the TTL.
+# Structure: (checked_at, response)
+HEALTH_CACHE_TTL_SECONDS = 20
+_health_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+_health_cache_lock = threading.Lock()
 
-    Returns:
-        Status of each service grouped by category.
-    """
-    # Verify superuser access
-    require_superuser(req)
 
-    def check_service(service):
-        """Check health of a single service."""
-        status = "unknown"
-        message = ""
-        response_time = None
+def _check_service(service: Service):
+    """Check health of a single service."""
+    status = "unknown"
+    message = ""
+    response_time = None
 
-        if service.get("url"):
-            try:
-                start_time = time.time()
-                response = requests.get(
-                    service["url"],
-                    timeout=5,
-                    headers={"User-Agent": "Ekklesia-HealthCheck/1.0"}
-                )
-                response_time = int((time.time() - start_time) * 1000)
-
-                if response.ok:
-                    status = "healthy"
-                    message = f"OK ({response_time}ms)"
-                else:
-                    status = "degraded"
-                    message = f"HTTP {response.status_code}"
-
-            except requests.Timeout:
-                status = "degraded"
-                message = "Timeout (>5s)"
-            except requests.RequestException as e:
-                status = "down"
-                message = str(e)[:50]
+    try:
+        start_time = time.time()
+        response = _http_session.get(service.url, timeout=5, stream=True)
+        response_time = int((time.time() - start_time) * 1000)
+        _release_probe_response(response)
+
+        if response.ok:
+            status = "healthy"
+            message = f"OK ({response_time}ms)"
         else:
-            message = "No health endpoint"
+            status = "degraded"
+            message = f"HTTP {response.status_code}"
 
-        return {
-            "id": service["id"],
-            "name": service["name"],
-            "status": status,
-            "message": message,
-            "responseTime": response_time
-        }
+    except requests.Timeout:
+        status = "degraded"
+        message = "Timeout (>5s)"
+    except requests.RequestException as e:
+        status = "down"
+        message = str(e)[:50]
 
-    results = []
+    return {
+        "id": service.id,
+        "name": service.name,
+        "status": status,
+        "message": message,
+        "responseTime": response_time
+    }
 
-    # Check Cloud Run services (GCP)
-    for service in CLOUD_RUN_SERVICES:
-        results.append(check_service(service))
 
-    # Check Firebase Callable Functions by pinging them
-    def check_callable_function(service, category):
-        """Check health of a Firebase Callable Function by making HTTP POST."""
-        func_name = service.get("function_name")
-        if not func_name:
-            # No function_name means we can't ping it safely
-            return {
-                "id": service["id"],
-                "name": service["name"],
-                "status": "available",
-                "message": "Tilbúið",
-                "responseTime": None,
-                "category": category
-            }
+def _check_callable_function(service, category, full_call=False):
+    """
+    Check health of a Firebase Callable Function.
 
-        url = f"{FUNCTIONS_BASE_URL}/{func_name}"
-        try:
-            start_time = time.time()
+    Sends an OPTIONS preflight, or with full_call a real callable POST that
+    runs the handler.
+    """
+    url = service["_probe_url"]
+    timeout = CALLABLE_FULL_PROBE_TIMEOUT if full_call else CALLABLE_PROBE_TIMEOUT
+
+    try:
+        start_time = time.time()
+        if full_call:
             # Callable functions expect POST with JSON body {"data": {...}}
-            response = requests.post(
+            response = _http_session.post(url, json={"data": {}}, timeout=timeout, stream=True)
+            healthy_statuses = (200,)
+        else:
+            # Proves the container starts and serves HTTP (see
+            # CALLABLE_HEALTHY_STATUSES); the handler itself is not run
+            response = _http_session.options(
                 url,
-                json={"data": {}},
-                timeout=10,
+                timeout=timeout,
                 headers={
-                    "Content-Type": "application/json",
-                    "User-Agent": "Ekklesia-HealthCheck/1.0"
-                }
+                    "Origin": "https://felagar.sosialistaflokkurinn.is",
+                    "Access-Control-Request-Method": "POST"
+                },
+                stream=True
             )
-            response_time = int((time.time() - start_time) * 1000)
-
-            # 200 = success, 401/403 = auth required but function is running
-            if response.status_code in [200, 401, 403]:
-                return {
-                    "id": service["id"],
-                    "name": service["name"],
-                    "status": "healthy",
-                    "message": f"OK ({response_time}ms)",
-                    "responseTime": response_time,
-                    "category": category
-                }
-            else:
-                return {
-                    "id": service["id"],
-                    "name": service["name"],
-                    "status": "degraded",
-                    "message": f"HTTP {response.status_code} ({response_time}ms)",
-                    "responseTime": response_time,
-                    "category": category
-                }
+            healthy_statuses = CALLABLE_HEALTHY_STATUSES
+        response_time = int((time.time() - start_time) * 1000)
+        _release_probe_response(response)
 
-        except requests.Timeout:
+        if response.status_code in healthy_statuses:
             return {
                 "id": service["id"],
                 "name": service["name"],
-                "status": "degraded",
-                "message": "Timeout (>10s)",
-                "responseTime": None,
+                "status": "healthy",
+                "message": f"OK ({response_time}ms)",
+                "responseTime": response_time,
                 "category": category
             }
-        except requests.RequestException as e:
+        else:
             return {
                 "id": service["id"],
                 "name": service["name"],
-                "status": "down",
-                "message": str(e)[:50],
-                "responseTime": None,
+                "status": "degraded",
+                "message": f"HTTP {response.status_code} ({response_time}ms)",
+                "responseTime": response_time,
                 "category": category
             }
 
-    # Add Firebase Functions by category
-    def add_functions(func_list, category):
-        for service in func_list:
-            results.append(check_callable_function(service, category))
-
-    # Ping lookup functions (safe - return static data, no auth required)
-    add_functions(LOOKUP_FUNCTIONS, "lookup")
+    except requests.Timeout:
+        return {
+            "id": service["id"],
+            "name": service["name"],
+            "status": "degraded",
+            "message": f"Timeout (>{timeout}s)",
+            "responseTime": None,
+            "category": category
+        }
+    except requests.RequestException as e:
+        return {
+            "id": service["id"],
+            "name": service["name"],
+            "status": "down",
+            "message": str(e)[:50],
+            "responseTime": None,
+            "category": category
+        }
 
-    # Other functions without function_name get "available" status
-    add_functions(MEMBER_FUNCTIONS, "member")
-    add_functions(ADDRESS_FUNCTIONS, "address")
-    add_functions(REGISTRATION_FUNCTIONS, "registration")
-    add_functions(SUPERUSER_FUNCTIONS, "superuser")
-    add_functions(EMAIL_FUNCTIONS, "email")
-    add_functions(HEATMAP_FUNCTIONS, "heatmap")
-    add_functions(ADMIN_MEMBER_FUNCTIONS, "admin")
 
-    # Check Firestore connectivity
+def _check_firestore():
+    """Check Firestore connectivity."""
     try:
-        db = firestore.client()
-        db.collection("_health").document("ping").set(
-            {"timestamp": firestore.SERVER_TIMESTAMP},
-            merge=True
-        )
-        results.append({
+        # A read proves connectivity (even if the doc is missing) without
+        # spending write quota on every dashboard poll
+        db = get_db()
+        db.collection("_health").document("ping").get()
+        return {
             "id": "firestore",
             "name": "Firestore",
             "status": "healthy",
             "message": "Connected"
-        })
+        }
     except Exception as e:
-        results.append({
+        return {
             "id": "firestore",
             "name": "Firestore",
             "status": "down",
             "message": str(e)[:50]
-        })
-
-    # Check Cloud SQL (PostgreSQL) via Admin API
-    try:
-        import google.auth
-        from google.auth.transport.requests import Request
+        }
 
-        # Get credentials and project
-        credentials, project = google.auth.default()
-        credentials.refresh(Request())
 
-        # Cloud SQL Admin API endpoint
-        instance_name = "ekklesia-db-eu1"
-        sql_api_url = f"https://sqladmin.googleapis.com/v1/projects/{project}/instances/{instance_name}"
+def _check_cloud_sql():
+    """Check Cloud SQL (PostgreSQL) via the Admin API."""
+    try:
+        # Get credentials and the Cloud SQL Admin API endpoint
+        credentials, sql_api_url = _get_sql_admin_credentials()
+        # Tokens last about an hour; `valid` turns False shortly before
+        # expiry, so warm instances only refresh when actually needed
+        if not credentials.valid:
+            credentials.refresh(Request())
 
         start_time = time.time()
-        response = requests.get(
+        response = _http_session.get(
             sql_api_url,
             headers={
                 "Authorization": f"Bearer {credentials.token}",
@@ -659,71 +831,193 @@ def check_system_health_handler(req: https_fn.CallableRequest) -> Dict[str, Any]
             data = response.json()
             state = data.get("state", "UNKNOWN")
             if state == "RUNNABLE":
-                results.append({
+                return {
                     "id": "cloudsql",
                     "name": "Cloud SQL (PostgreSQL)",
                     "status": "healthy",
                     "message": f"Running ({response_time}ms)",
                     "responseTime": response_time
-                })
+                }
             else:
-                results.append({
+                return {
                     "id": "cloudsql",
                     "name": "Cloud SQL (PostgreSQL)",
                     "status": "degraded",
                     "message": f"State: {state}",
                     "responseTime": response_time
-                })
+                }
         else:
-            results.append({
+            return {
                 "id": "cloudsql",
                 "name": "Cloud SQL (PostgreSQL)",
                 "status": "degraded",
                 "message": f"API error: {response.status_code}"
-            })
+            }
     except Exception as e:
-        results.append({
+        return {
             "id": "cloudsql",
             "name": "Cloud SQL (PostgreSQL)",
             "status": "unknown",
             "message": str(e)[:50]
-        })
+        }
 
-    # Add Firebase infrastructure (always available - no health endpoint)
-    results.append({
+
+def _build_health_probes() -> List:
+    """
+    Return zero-argument probes for every service that is actually checked.
+
+    Every CALLABLE_FULL_PROBE_EVERY-th call (starting with the first) makes
+    the callable probes real invocations instead of OPTIONS preflights.
+    """
+    global _health_run_count
+    with _health_run_count_lock:
+        full_call = _health_run_count % CALLABLE_FULL_PROBE_EVERY == 0
+        _health_run_count += 1
+
+    # Cloud Run services (GCP) first, then Firebase Functions by category.
+    # Only functions with a probe URL are pinged (lookup functions - safe,
+    # return static data, no auth required); the rest are reported from
+    # _AVAILABLE_FUNCTION_RESULTS without going through the pool.
+    probes = [functools.partial(_check_service, service) for service in CLOUD_RUN_SERVICES]
+    for func_list, category in _FUNCTION_CATEGORIES:
+        probes.extend(functools.partial(_check_callable_function, service, category, full_call)
+                      for service in func_list if "_probe_url" in service)
+
+    # Firestore and Cloud SQL SDK calls block too, so they share the pool
+    probes.append(_check_firestore)
+    probes.append(_check_cloud_sql)
+    return probes
+
+
+# Firebase infrastructure (always available - no health endpoint)
+_INFRASTRUCTURE_RESULTS = (
+    {
         "id": "firebase-auth",
         "name": "Firebase Auth",
         "status": "available",
         "message": "Tilbúið"
-    })
-    results.append({
+    },
+    {
         "id": "firebase-hosting",
         "name": "Firebase Hosting",
         "status": "available",
         "message": "Tilbúið"
-    })
+    },
+)
 
-    # Summary - count "available" as healthy (Firebase Functions without health endpoint)
-    healthy_count = sum(1 for r in results if r["status"] in ("healthy", "available"))
-    degraded_count = sum(1 for r in results if r["status"] == "degraded")
-    down_count = sum(1 for r in results if r["status"] == "down")
 
+def _summarize_health(status_counts: Counter, total: int) -> Dict[str, int]:
+    """Build the health summary from tallied statuses."""
+    # Count "available" as healthy (Firebase Functions without health endpoint)
     return {
+        "healthy": status_counts["healthy"] + status_counts["available"],
+        "degraded": status_counts["degraded"],
+        "down": status_counts["down"],
+        "total": total
+    }
+
+
+def check_system_health_handler(req: https_fn.CallableRequest) -> Dict[str, Any]:
+    """
+    Check health of all services (GCP, external, Firebase functions).
+    Bypasses CORS issues by making server-side requests.
+    Results are reused for HEALTH_CACHE_TTL_SECONDS and flagged "cached".
+
+    Returns:
+        Status of each service grouped by category.
+    """
+    global _health_cache
+
+    # Verify superuser access
+    require_superuser(req)
+
+    with _health_cache_lock:
+        cached = _health_cache
+    if cached and time.time() - cached[0] < HEALTH_CACHE_TTL_SECONDS:
+        return {**cached[1], "cached": True}
+
+    # Statuses are tallied as results are collected, so the summary needs
+    # no extra pass over the list
+    results = []
+    status_counts = Counter()
+
+    def add_result(result):
+        results.append(result)
+        status_counts[result["status"]] += 1
+
+    # Run all probes concurrently - total latency is the slowest probe
+    # rather than the sum (map() keeps the original order)
+    with ThreadPoolExecutor(max_workers=HEALTH_PROBE_MAX_WORKERS) as executor:
+        for result in executor.map(lambda probe: probe(), _build_health_probes()):
+            add_result(result)
+
+    # Static results are copied so callers can't mutate the shared tables
+    for result in (*_AVAILABLE_FUNCTION_RESULTS, *_INFRASTRUCTURE_RESULTS):
+        add_result(dict(result))
+
+    response = {
         "services": results,
-        "summary": {
-            "healthy": healthy_count,
-            "degraded": degraded_count,
-            "down": down_count,
-            "total": len(results)
-        },
+        "summary": _summarize_health(status_counts, len(results)),
         "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
     }
 
+    with _health_cache_lock:
+        _health_cache = (time.time(), response)
+
+    return response
+
+
+# Cloud SQL instance probed by the health check
+CLOUD_SQL_INSTANCE = "ekklesia-db-eu1"
+
+# Default credentials and the Admin API URL are resolved once per instance;
+# the project never changes at runtime.
+_sql_admin_credentials = None
+_sql_api_url: Optional[str] = None
+
+
+def _get_sql_admin_credentials():
+    """Return (credentials, Cloud SQL Admin API URL), discovering them once."""
+    global _sql_admin_credentials, _sql_api_url
+    if _sql_admin_credentials is None:
+        credentials, project = google.auth.default()
+        _sql_api_url = f"https://sqladmin.googleapis.com/v1/projects/{project}/instances/{CLOUD_SQL_INSTANCE}"
+        _sql_admin_credentials = credentials
+    return _sql_admin_credentials, _sql_api_url
+
 
 # ==============================================================================
 # AUDIT LOGS
 # ==============================================================================
 
+# Correlation IDs: alphanumeric + dashes only, max 64 chars. \Z rather than
+# $ so a trailing newline is rejected too.
+_CORRELATION_ID_RE = re.compile(r'^[a-zA-Z0-9\-]{1,64}\Z')
+
+# Security: Allowlist for service names to prevent filter injection
+_ALLOWED_LOG_SERVICES = frozenset({
+    "handlekenniauth", "verifymembership", "updatememberprofile",
+    "softdeleteself", "reactivateself", "search-addresses",
+    "validate-address", "validate-postal-code", "list-unions", "list-job-titles",
+    "list-countries", "list-postal-codes", "get-cells-by-postal-code",
+    "register-member", "checksystemhealth", "setuserrole", "getuserrole",
+    "getauditlogs", "getloginaudit", "harddeletemember", "anonymizemember",
+    "listelevatedusers", "purgedeleted"
+})
+_ALLOWED_LOG_SEVERITIES = frozenset({
+    "DEBUG", "INFO", "NOTICE", "WARNING", "ERROR", "CRITICAL", "ALERT", "EMERGENCY"
+})
+
+# Recent audit log responses, so rapid UI refreshes don't each spend Cloud
+# Logging read quota. Keyed on the validated query parameters rather than the
+# filter string, whose start time moves every second; expired entries are
+# pruned on insert.
+# Structure: { (service, severity, correlation_id, hours, limit): (cached_at, response) }
+AUDIT_LOGS_CACHE_TTL_SECONDS = 30
+_audit_logs_cache: Dict[Tuple[Optional[str], Optional[str], Optional[str], int, int], Tuple[float, Dict[str, Any]]] = {}
+_audit_logs_cache_lock = threading.Lock()
+
+
 def get_audit_logs_handler(req: https_fn.CallableRequest) -> Dict[str, Any]:
     """
     Query Cloud Logging for audit events.
@@ -748,25 +1042,13 @@ def get_audit_logs_handler(req: https_fn.CallableRequest) -> Dict[str, Any]:
     correlation_id = data.get("correlation_id")
     limit = min(data.get("limit", 100), 500)  # Cap at 500
 
-    # Security: Allowlist for service names to prevent filter injection
-    ALLOWED_SERVICES = {
-        "handlekenniauth", "verifymembership", "updatememberprofile",
-        "softdeleteself", "reactivateself", "search-addresses",
-        "validate-address", "validate-postal-code", "list-unions", "list-job-titles",
-        "list-countries", "list-postal-codes", "get-cells-by-postal-code",
-        "register-member", "checksystemhealth", "setuserrole", "getuserrole",
-        "getauditlogs", "getloginaudit", "harddeletemember", "anonymizemember",
-        "listelevatedusers", "purgedeleted"
-    }
-    ALLOWED_SEVERITIES = {"DEBUG", "INFO", "NOTICE", "WARNING", "ERROR", "CRITICAL", "ALERT", "EMERGENCY"}
-
-    if service and service not in ALLOWED_SERVICES:
+    if service and service not in _ALLOWED_LOG_SERVICES:
         raise https_fn.HttpsError(
             code=https_fn.FunctionsErrorCode.INVALID_ARGUMENT,
             message="Invalid service name"
         )
 
-    if severity and severity.upper() not in ALLOWED_SEVERITIES:
+    if severity and severity.upper() not in _ALLOWED_LOG_SEVERITIES:
         raise https_fn.HttpsError(
             code=https_fn.FunctionsErrorCode.INVALID_ARGUMENT,
             message="Invalid severity level"
@@ -778,7 +1060,7 @@ def get_audit_logs_handler(req: https_fn.CallableRequest) -> Dict[str, Any]:
 
     # Security: Sanitize correlation_id (alphanumeric + dashes only, max 64 chars)
     if correlation_id:
-        if not re.match(r'^[a-zA-Z0-9\-]{1,64}$', str(correlation_id)):
+        if not _CORRELATION_ID_RE.match(str(correlation_id)):
             raise https_fn.HttpsError(
                 code=https_fn.FunctionsErrorCode.INVALID_ARGUMENT,
                 message="Invalid correlation_id format"
@@ -792,81 +1074,23 @@ def get_audit_logs_handler(req: https_fn.CallableRequest) -> Dict[str, Any]:
                 message="Cloud Logging client not available"
             )
 
-        # Build filter
-        filters = [
-            'resource.type="cloud_function"',
-            f'timestamp>="{_hours_ago(hours)}"'
-        ]
+        cache_key = (service, severity, correlation_id, hours, limit)
 
-        if service:
-            filters.append(f'resource.labels.function_name="{service}"')
-
-        if severity:
-            filters.append(f'severity="{severity}"')
-
-        if correlation_id:
-            filters.append(f'jsonPayload.correlationId="{correlation_id}"')
-
-        filter_str = " AND ".join(filters)
-
-# ... inside get_audit_logs_handler ...
-
-        # Query logs
-        entries = []
-        for entry in client.list_entries(filter_=filter_str, max_results=limit):
-            # entry.payload is usually a dict (or OrderedDict) for JSON payloads
-            payload = entry.payload if isinstance(entry.payload, dict) else {"message": str(entry.payload)}
-            
-            # Default values
-            message = payload.get("message") or payload.get("msg")
-            action = None
-            resource = None
-            status = None
-            user = payload.get("user") or payload.get("uid")
-
-            # DETECT STRUCTURED AUDIT LOG (GCP Audit Log)
-            # Check for keys present in the raw OrderedDict output seen in logs
-            if not message and "authenticationInfo" in payload and "methodName" in payload:
-                try:
-                    auth_info = payload.get("authenticationInfo", {})
-                    # request_meta = payload.get("requestMetadata", {}) # Not used currently
-                    authz_info_list = payload.get("authorizationInfo", [])
-                    authz_info = authz_info_list[0] if authz_info_list else {}
-                    
-                    user_email = auth_info.get("principalEmail")
-                    method = payload.get("methodName", "").split(".")[-1] # Shorten: google...UpdateFunction -> UpdateFunction
-                    res_name = payload.get("resourceName", "").split("/")[-1] # Shorten resource
-                    
-                    # Set structured fields
-                    user = user_email
-                    action = method
-                    resource = res_name
-                    status = "Granted" if authz_info.get("granted") else "Denied"
-                    
-                    # Format human-readable message
-                    message = f"{user_email} performed {method} on {res_name}"
-                    
-                except Exception as parse_error:
-                    log_json("warning", "Failed to parse structured audit log", error=str(parse_error))
-            
-            # Fallback if message is still empty
-            if not message:
-                message = str(payload)
-
-            entries.append({
-                "timestamp": entry.timestamp.isoformat() if entry.timestamp else None,
-                "severity": entry.severity,
-                "service": entry.resource.labels.get("function_name") if entry.resource else None,
-                "message": message,
-                "correlationId": payload.get("correlationId") or payload.get("correlation_id"),
-                "user": user,
-                "action": action,
-                "resource": resource,
-                "status": status,
-                "error": payload.get("error")
-            })
+        with _audit_logs_cache_lock:
+            cached = _audit_logs_cache.get(cache_key)
+        if cached and time.time() - cached[0] < AUDIT_LOGS_CACHE_TTL_SECONDS:
+            return cached[1]
 
-        return {
+        filter_str = _build_log_filter(service, severity, correlation_id, _hours_ago(hours))
+
+        # Query logs - one page covers the whole limit (capped at 500, below
+        # the API's 1000 maximum), so no follow-up page RPCs are needed
+        entries = [
+            _parse_entry(entry)
+            for entry in client.list_entries(filter_=filter_str, max_results=limit, page_size=limit)
+        ]
+
+        response = {
             "logs": entries,
             "count": len(entries),
             "filter": {
@@ -877,6 +1101,15 @@ def get_audit_logs_handler(req: https_fn.CallableRequest) -> Dict[str, Any]:
             }
         }
 
+        now = time.time()
+        with _audit_logs_cache_lock:
+            for key in [key for key, (cached_at, _) in _audit_logs_cache.items()
+                        if now - cached_at >= AUDIT_LOGS_CACHE_TTL_SECONDS]:
+                del _audit_logs_cache[key]
+            _audit_logs_cache[cache_key] = (now, response)
+
+        return response
+
     except Exception as e:
         log_json("error", "Failed to fetch audit logs", error=str(e))
         raise https_fn.HttpsError(
@@ -885,9 +1118,123 @@ def get_audit_logs_handler(req: https_fn.CallableRequest) -> Dict[str, Any]:
         )
 
 
+def _parse_structured_audit(payload: Dict[str, Any], auth_info: Dict[str, Any],
+                            method_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Summarize a GCP audit log payload (authenticationInfo + methodName).
+
+    Returns:
+        Dict with user, action, resource, status and message, or None if the
+        payload could not be parsed.
+    """
+    try:
+        # request_meta = payload.get("requestMetadata", {}) # Not used currently
+        authz_info_list = payload.get("authorizationInfo", [])
+        authz_info = authz_info_list[0] if authz_info_list else {}
+
+        user_email = auth_info.get("principalEmail")
+        method = method_name.split(".")[-1] # Shorten: google...UpdateFunction -> UpdateFunction
+        res_name = payload.get("resourceName", "").split("/")[-1] # Shorten resource
+
+        return {
+            "user": user_email,
+            "action": method,
+            "resource": res_name,
+            "status": "Granted" if authz_info.get("granted") else "Denied",
+            # Format human-readable message
+            "message": f"{user_email} performed {method} on {res_name}",
+        }
+    except Exception as parse_error:
+        log_json("warning", "Failed to parse structured audit log", error=str(parse_error))
+        return None
+
+
+def _parse_entry(entry) -> Dict[str, Any]:
+    """Convert a Cloud Logging entry into the audit log row sent to the UI."""
+    # entry.payload is usually a dict (or OrderedDict) for JSON payloads
+    payload = entry.payload if isinstance(entry.payload, dict) else {"message": _safe_payload_str(entry.payload)}
+
+    # Default values
+    message = payload.get("message") or payload.get("msg")
+    action = None
+    resource = None
+    status = None
+    user = None
+
+    # DETECT STRUCTURED AUDIT LOG (GCP Audit Log)
+    # Check for keys present in the raw OrderedDict output seen in logs.
+    # Each key is read once and reused below.
+    auth_info = method_name = None
+    if not message:
+        auth_info = payload.get("authenticationInfo")
+        if auth_info is not None:
+            method_name = payload.get("methodName")
+    if auth_info is not None and method_name is not None:
+        audit = _parse_structured_audit(payload, auth_info, method_name)
+        if audit:
+            user = audit["user"]
+            action = audit["action"]
+            resource = audit["resource"]
+            status = audit["status"]
+            message = audit["message"]
+
+    # Fallback if message is still empty
+    if not message:
+        message = _safe_payload_str(payload)
+    if user is None:
+        user = payload.get("user") or payload.get("uid")
+
+    error = payload.get("error")
+    return {
+        "timestamp": entry.timestamp.isoformat() if entry.timestamp else None,
+        "severity": entry.severity,
+        "service": entry.resource.labels.get("function_name") if entry.resource else None,
+        "message": message,
+        "correlationId": payload.get("correlationId") or payload.get("correlation_id"),
+        "user": user,
+        "action": action,
+        "resource": resource,
+        "status": status,
+        "error": _safe_payload_str(error) if error is not None else None
+    }
+
+
+def _safe_payload_str(payload: Any, limit: int = 512) -> str:
+    """Return a compact JSON form of a log payload, capped at `limit` characters."""
+    if isinstance(payload, str):
+        s = payload
+    else:
+        s = json.dumps(payload, default=str, ensure_ascii=False, separators=(",", ":"))
+    if len(s) > limit:
+        return s[:limit] + "..."
+    return s
+
+
+def _build_log_filter(service: str, severity: str, correlation_id: str, since: str) -> str:
+    """
+    Build the Cloud Logging filter for an audit log query.
+
+    Inputs must already be validated against the allowlists.
+    """
+    filters = [
+        'resource.type="cloud_function"',
+        f'timestamp>="{since}"'
+    ]
+
+    if service:
+        filters.append(f'resource.labels.function_name="{service}"')
+
+    if severity:
+        filters.append(f'severity="{severity}"')
+
+    if correlation_id:
+        filters.append(f'jsonPayload.correlationId="{correlation_id}"')
+
+    return " AND ".join(filters)
+
+
 def _hours_ago(hours: int) -> str:
     """Return ISO timestamp for N hours ago."""
-    from datetime import datetime, timedelta, timezone
     dt = datetime.now(timezone.utc) - timedelta(hours=hours)
     return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
 
@@ -896,6 +1243,57 @@ def _hours_ago(hours: int) -> str:
 # DANGEROUS OPERATIONS
 # ==============================================================================
 
+# Destructive operations share one in-flight slot per superuser, so two
+# concurrent calls can't race on the same member or double-write audit logs.
+DESTRUCTIVE_MAX_CONCURRENT = 1
+DESTRUCTIVE_SLOT_LEASE_SECONDS = 600  # Longer than any function timeout
+
+
+@contextmanager
+def destructive_operation_slot(caller_uid: str):
+    """
+    Hold the caller's destructive-operation slot for the duration of the block.
+
+    Raises:
+        https_fn.HttpsError: If another destructive operation by the same
+            caller is still in flight.
+    """
+    slot_id = acquire_concurrency_slot(
+        caller_uid, "superuser_destructive",
+        max_concurrent=DESTRUCTIVE_MAX_CONCURRENT,
+        lease_seconds=DESTRUCTIVE_SLOT_LEASE_SECONDS
+    )
+    if slot_id is None:
+        raise https_fn.HttpsError(
+            code=https_fn.FunctionsErrorCode.RESOURCE_EXHAUSTED,
+            message="Another destructive operation is already in progress."
+        )
+    try:
+        yield
+    finally:
+        release_concurrency_slot(caller_uid, "superuser_destructive", slot_id)
+
+
+def _resolve_firebase_uid(db, member: Dict[str, Any]) -> Optional[str]:
+    """
+    Return the member's Firebase UID.
+
+    Uses the firebase_uid column synced to Cloud SQL on login, falling back
+    to a /users lookup by kennitala for members whose row predates the sync.
+    """
+    firebase_uid = member.get("firebase_uid")
+    if firebase_uid:
+        return firebase_uid
+
+    kennitala = member.get("kennitala")
+    if not kennitala:
+        return None
+    # Only the document id is needed, so don't pull the whole profile
+    query = db.collection("users").select(["kennitala"]).where("kennitala", "==", kennitala).limit(1)
+    user_doc = next(query.stream(), None)
+    return user_doc.id if user_doc else None
+
+
 def hard_delete_member_handler(req: https_fn.CallableRequest) -> Dict[str, Any]:
     """
     Permanently delete a member from all systems.
@@ -911,13 +1309,6 @@ def hard_delete_member_handler(req: https_fn.CallableRequest) -> Dict[str, Any]:
     require_superuser(req)
     caller_uid = req.auth.uid
 
-    # Security: Rate limit destructive operations (3 per hour)
-    if not check_uid_rate_limit(caller_uid, "hard_delete", max_attempts=3, window_minutes=60):
-        raise https_fn.HttpsError(
-            code=https_fn.FunctionsErrorCode.RESOURCE_EXHAUSTED,
-            message="Rate limit exceeded. Maximum 3 deletions per hour."
-        )
-
     data = req.data or {}
     member_id = data.get("member_id")
     confirmation = data.get("confirmation")
@@ -934,78 +1325,93 @@ def hard_delete_member_handler(req: https_fn.CallableRequest) -> Dict[str, Any]:
             message="Invalid confirmation phrase"
         )
 
-    db = firestore.client()
-    deleted_items = []
-    errors = []
-
-    try:
-        # 1. Verify member exists in Cloud SQL (source of truth)
-        member = get_member_by_django_id(int(member_id))
-
-        if not member:
-            raise https_fn.HttpsError(
-                code=https_fn.FunctionsErrorCode.NOT_FOUND,
-                message=f"Member not found: {member_id}"
-            )
+    # Security: Rate limit destructive operations (3 per hour)
+    allowed, retry_after = check_uid_rate_limit_with_retry(caller_uid, "hard_delete", max_attempts=3, window_minutes=60)
+    if not allowed:
+        raise https_fn.HttpsError(
+            code=https_fn.FunctionsErrorCode.RESOURCE_EXHAUSTED,
+            message="Rate limit exceeded. Maximum 3 deletions per hour.",
+            details={"retry_after_seconds": retry_after}
+        )
 
-        kennitala = member.get("kennitala")
+    with destructive_operation_slot(caller_uid):
+        db = get_db()
+        deleted_items = []
+        errors = []
+        masked_kt = "unknown"
 
-        # 2. Find firebase_uid by querying /users collection
-        firebase_uid = None
-        users_query = db.collection("users").where("kennitala", "==", kennitala).limit(1).stream()
-        for user_doc in users_query:
-            firebase_uid = user_doc.id
-            break
+        try:
+            # 1. Verify member exists in Cloud SQL (source of truth)
+            member = get_member_by_django_id(int(member_id))
 
-        # 3. Delete Firebase Auth user if exists
-        if firebase_uid:
-            try:
-                auth.delete_user(firebase_uid)
-                deleted_items.append(f"Firebase Auth user: {firebase_uid}")
-            except auth.UserNotFoundError:
-                pass  # Already deleted
-            except Exception as e:
-                errors.append(f"Firebase Auth: {str(e)}")
-
-        # 4. Delete from /users/ collection
-        if firebase_uid:
-            try:
-                db.collection("users").document(firebase_uid).delete()
-                deleted_items.append(f"Firestore /users/{firebase_uid}")
-            except Exception as e:
-                errors.append(f"Firestore /users/: {str(e)}")
+            if not member:
+                raise https_fn.HttpsError(
+                    code=https_fn.FunctionsErrorCode.NOT_FOUND,
+                    message=f"Member not found: {member_id}"
+                )
 
-        # 5. Delete from Cloud SQL (source of truth)
-        sql_result = hard_delete_member_sql(int(member_id))
-        if sql_result["success"]:
-            deleted_items.append("Cloud SQL member record")
-            deleted_items.extend(sql_result.get("deleted_tables", []))
-        else:
-            errors.extend(sql_result.get("errors", []))
+            kennitala = member.get("kennitala")
+            masked_kt = (kennitala[:6] + "****") if kennitala else "unknown"
+
+            # 2. Find firebase_uid (stored on the member row at login)
+            firebase_uid = _resolve_firebase_uid(db, member)
+
+            # 3-4. Delete Firebase Auth user and /users/ document if they exist
+            if firebase_uid:
+                firebase_deletes = (
+                    # (error label, deleted item, delete call)
+                    ("Firebase Auth", f"Firebase Auth user: {firebase_uid}",
+                     functools.partial(auth.delete_user, firebase_uid)),
+                    ("Firestore /users/", f"Firestore /users/{firebase_uid}",
+                     db.collection("users").document(firebase_uid).delete),
+                )
+                # Independent services, so run them concurrently and wait
+                # for the slower one rather than both in turn
+                with ThreadPoolExecutor(max_workers=len(firebase_deletes)) as executor:
+                    futures = [(label, item, executor.submit(delete))
+                               for label, item, delete in firebase_deletes]
+                    for label, item, future in futures:
+                        try:
+                            future.result()
+                            deleted_items.append(item)
+                        except auth.UserNotFoundError:
+                            pass  # Already deleted
+                        except Exception as e:
+                            errors.append(f"{label}: {str(e)}")
+                _invalidate_user_role_cache(firebase_uid)
+                _invalidate_elevated_users_cache()
+
+            # 5. Delete from Cloud SQL (source of truth)
+            sql_result = hard_delete_member_sql(int(member_id))
+            if sql_result["success"]:
+                deleted_items.append("Cloud SQL member record")
+                deleted_items.extend(sql_result.get("deleted_tables", []))
+            else:
+                errors.extend(sql_result.get("errors", []))
 
-        # 6. Log the action
-        log_json("warning", "DANGEROUS: Member hard deleted",
-                 action="hard_delete_member",
-                 caller_uid=caller_uid,
-                 kennitala=kennitala[:6] + "****",  # Partial kennitala for audit
-                 deleted_items=deleted_items,
-                 errors=errors if errors else None)
+            # 6. Log the action
+            log_json("warning", "DANGEROUS: Member hard deleted",
+                     action="hard_delete_member",
+                     caller_uid=caller_uid,
+                     kennitala=masked_kt,  # Partial kennitala for audit
+                     deleted_items=deleted_items,
+                     errors=errors if errors else None)
 
-        return {
-            "success": len(errors) == 0,
-            "deleted": deleted_items,
-            "errors": errors if errors else None,
-            "message": "Member permanently deleted" if not errors else "Partial deletion - check errors"
-        }
+            return {
+                "success": len(errors) == 0,
+                "deleted": deleted_items,
+                "errors": errors if errors else None,
+                "message": "Member permanently deleted" if not errors else "Partial deletion - check errors"
+            }
 
-    except https_fn.HttpsError:
-        raise
-    except Exception as e:
-        log_json("error", "Hard delete failed", error=str(e), kennitala=kennitala[:6] + "****")
-        raise https_fn.HttpsError(
-            code=https_fn.FunctionsErrorCode.INTERNAL,
-            message=f"Deletion failed: {str(e)}"
-        )
+        except https_fn.HttpsError:
+            raise
+        except Exception as e:
+            log_json("error", "Hard delete failed", error=str(e), kennitala=masked_kt)
+            raise https_fn.HttpsError(
+                code=https_fn.FunctionsErrorCode.INTERNAL,
+                message=f"Deletion failed: {str(e)}"
+            )
 
 
 def anonymize_member_handler(req: https_fn.CallableRequest) -> Dict[str, Any]:
@@ -1024,13 +1430,6 @@ def anonymize_member_handler(req: https_fn.CallableRequest) -> Dict[str, Any]:
     require_superuser(req)
     caller_uid = req.auth.uid
 
-    # Security: Rate limit destructive operations (5 per hour for anonymization)
-    if not check_uid_rate_limit(caller_uid, "anonymize", max_attempts=5, window_minutes=60):
-        raise https_fn.HttpsError(
-            code=https_fn.FunctionsErrorCode.RESOURCE_EXHAUSTED,
-            message="Rate limit exceeded. Maximum 5 anonymizations per hour."
-        )
-
     data = req.data or {}
     member_id = data.get("member_id")
     confirmation = data.get("confirmation")
@@ -1047,93 +1446,111 @@ def anonymize_member_handler(req: https_fn.CallableRequest) -> Dict[str, Any]:
             message="Invalid confirmation phrase"
         )
 
-    db = firestore.client()
-
-    try:
-        # 1. Verify member exists in Cloud SQL (source of truth)
-        member = get_member_by_django_id(int(member_id))
-
-        if not member:
-            raise https_fn.HttpsError(
-                code=https_fn.FunctionsErrorCode.NOT_FOUND,
-                message=f"Member not found: {member_id}"
-            )
-
-        kennitala = member.get("kennitala")
-
-        # 2. Find firebase_uid by querying /users collection
-        firebase_uid = None
-        users_query = db.collection("users").where("kennitala", "==", kennitala).limit(1).stream()
-        for user_doc in users_query:
-            firebase_uid = user_doc.id
-            break
+    # Security: Rate limit destructive operations (5 per hour for anonymization)
+    allowed, retry_after = check_uid_rate_limit_with_retry(caller_uid, "anonymize", max_attempts=5, window_minutes=60)
+    if not allowed:
+        raise https_fn.HttpsError(
+            code=https_fn.FunctionsErrorCode.RESOURCE_EXHAUSTED,
+            message="Rate limit exceeded. Maximum 5 anonymizations per hour.",
+            details={"retry_after_seconds": retry_after}
+        )
 
-        # Generate anonymous ID
-        import uuid
-        anon_id = f"ANON-{uuid.uuid4().hex[:8].upper()}"
+    with destructive_operation_slot(caller_uid):
+        db = get_db()
 
-        anonymized_items = []
+        try:
+            # 1. Verify member exists in Cloud SQL (source of truth)
+            member = get_member_by_django_id(int(member_id))
 
-        # 3. Anonymize Firebase Auth user if exists
-        if firebase_uid:
-            try:
-                auth.update_user(
-                    firebase_uid,
-                    display_name=anon_id,
-                    email=f"{anon_id.lower()}@anonymized.local",
-                    disabled=True
+            if not member:
+                raise https_fn.HttpsError(
+                    code=https_fn.FunctionsErrorCode.NOT_FOUND,
+                    message=f"Member not found: {member_id}"
                 )
-                anonymized_items.append("Firebase Auth")
-            except Exception as e:
-                log_json("warning", "Could not anonymize Firebase Auth user",
-                         error=str(e), uid=firebase_uid)
 
-            # 4. Delete /users document (contains preferences)
-            try:
-                db.collection("users").document(firebase_uid).delete()
-                anonymized_items.append("/users document")
-            except Exception as e:
-                log_json("warning", "Could not delete /users document",
-                         error=str(e), uid=firebase_uid)
-
-        # 5. Anonymize in Cloud SQL (source of truth)
-        sql_result = anonymize_member_sql(int(member_id), anon_id)
-        if sql_result["success"]:
-            anonymized_items.append("Cloud SQL member record")
-            anonymized_items.extend(sql_result.get("anonymized_fields", []))
-        else:
-            log_json("warning", "Cloud SQL anonymization had errors",
-                     errors=sql_result.get("errors"))
+            kennitala = member.get("kennitala")
+            masked_kt = (kennitala[:6] + "****") if kennitala else "unknown"
+
+            # 2. Find firebase_uid (stored on the member row at login)
+            firebase_uid = _resolve_firebase_uid(db, member)
+
+            # Generate anonymous ID
+            anon_id = f"ANON-{secrets.token_hex(4).upper()}"
+
+            anonymized_items = []
+
+            # 3-4. Anonymize Firebase Auth user and delete /users document
+            # (contains preferences) if they exist
+            if firebase_uid:
+                firebase_updates = (
+                    # (anonymized item, warning on failure, update call)
+                    ("Firebase Auth", "Could not anonymize Firebase Auth user",
+                     functools.partial(
+                         auth.update_user,
+                         firebase_uid,
+                         display_name=anon_id,
+                         email=f"{anon_id.lower()}@anonymized.local",
+                         disabled=True
+                     )),
+                    ("/users document", "Could not delete /users document",
+                     db.collection("users").document(firebase_uid).delete),
+                )
+                # Independent services, so run them concurrently and wait
+                # for the slower one rather than both in turn
+                with ThreadPoolExecutor(max_workers=len(firebase_updates)) as executor:
+                    futures = [(item, warning, executor.submit(update))
+                               for item, warning, update in firebase_updates]
+                    for item, warning, future in futures:
+                        try:
+                            future.result()
+                            anonymized_items.append(item)
+                        except Exception as e:
+                            log_json("warning", warning,
+                                     error=str(e), uid=firebase_uid)
+                _invalidate_user_role_cache(firebase_uid)
+                _invalidate_elevated_users_cache()
+
+            # 5. Anonymize in Cloud SQL (source of truth)
+            sql_result = anonymize_member_sql(int(member_id), anon_id)
+            if sql_result["success"]:
+                anonymized_items.append("Cloud SQL member record")
+                anonymized_items.extend(sql_result.get("anonymized_fields", []))
+            else:
+                log_json("warning", "Cloud SQL anonymization had errors",
+                         errors=sql_result.get("errors"))
 
-        # Log the action
-        log_json("warning", "DANGEROUS: Member anonymized (GDPR)",
-                 action="anonymize_member",
-                 caller_uid=caller_uid,
-                 original_kennitala=kennitala[:6] + "****",
-                 anon_id=anon_id,
-                 items=anonymized_items)
+            # Log the action
+            log_json("warning", "DANGEROUS: Member anonymized (GDPR)",
+                     action="anonymize_member",
+                     caller_uid=caller_uid,
+                     original_kennitala=masked_kt,
+                     anon_id=anon_id,
+                     items=anonymized_items)
 
-        return {
-            "success": True,
-            "anon_id": anon_id,
-            "anonymized": anonymized_items,
-            "message": f"Member anonymized as {anon_id} in Firebase and Cloud SQL."
-        }
+            return {
+                "success": True,
+                "anon_id": anon_id,
+                "anonymized": anonymized_items,
+                "message": f"Member anonymized as {anon_id} in Firebase and Cloud SQL."
+            }
 
-    except https_fn.HttpsError:
-        raise
-    except Exception as e:
-        log_json("error", "Anonymization failed", error=str(e))
-        raise https_fn.HttpsError(
-            code=https_fn.FunctionsErrorCode.INTERNAL,
-            message=f"Anonymization failed: {str(e)}"
-        )
+        except https_fn.HttpsError:
+            raise
+        except Exception as e:
+            log_json("error", "Anonymization failed", error=str(e))
+            raise https_fn.HttpsError(
+                code=https_fn.FunctionsErrorCode.INTERNAL,
+                message=f"Anonymization failed: {str(e)}"
+            )
 
 
 # ==============================================================================
 # LIST ELEVATED USERS
 # ==============================================================================
 
+# /users fields read by list_elevated_users_handler (projection)
+ELEVATED_USER_FIELDS = ["kennitala", "displayName", "displayNameLower", "fullName", "email", "roleUpdatedAt", "roles"]
+
 def list_elevated_users_handler(req: https_fn.CallableRequest) -> Dict[str, Any]:
     """
     List all users with elevated privileges (admin, superuser, staff).
@@ -1145,48 +1562,105 @@ def list_elevated_users_handler(req: https_fn.CallableRequest) -> Dict[str, Any]
     3. Checks /members/ collection for Django is_staff/is_superuser/is_admin flags
        (synced from Django, catches users who haven't logged in yet)
 
+    Optional data:
+        - page_size: Return at most this many users, ordered by name
+        - start_after: next_cursor from the previous page
+          ({"displayNameLower": ..., "uid": ...})
+
+    Paged results are ordered server-side on displayNameLower, then document
+    id so users sharing a name are never skipped at a page boundary (roles,
+    displayNameLower, __name__ index). Firestore only orders documents that
+    have displayNameLower; setUserRole and login write it, and
+    scripts/backfill-display-name-lower.js covers older documents, so pages
+    and the full listing return the same users.
+
+    The full (unpaged) listing is cached for ELEVATED_USERS_CACHE_TTL_SECONDS.
+
     Returns:
         Lists of superusers and admins with their info.
     """
+    global _elevated_users_cache
+
     # Verify superuser access
     require_superuser(req)
 
-    db = firestore.client()
+    data = req.data or {}
+    page_size = data.get("page_size")
+    start_after = data.get("start_after")
+    if page_size is not None:
+        if not isinstance(page_size, int) or page_size < 1:
+            raise https_fn.HttpsError(
+                code=https_fn.FunctionsErrorCode.INVALID_ARGUMENT,
+                message="page_size must be a positive integer"
+            )
+        page_size = min(page_size, 500)
+        if start_after is not None and not (
+                isinstance(start_after, dict)
+                and isinstance(start_after.get("displayNameLower"), str)
+                and isinstance(start_after.get("uid"), str)
+                and start_after["uid"]):
+            raise https_fn.HttpsError(
+                code=https_fn.FunctionsErrorCode.INVALID_ARGUMENT,
+                message="start_after must be a next_cursor from a previous page"
+            )
+    else:
+        with _elevated_users_cache_lock:
+            cached = _elevated_users_cache
+        if cached and time.time() - cached[0] < ELEVATED_USERS_CACHE_TTL_SECONDS:
+            return cached[1]
+
+    db = get_db()
 
     try:
         # Track by UID or kennitala to avoid duplicates
-        superusers_map = {}  # keyed by uid
-        admins_map = {}      # keyed by uid
+        superusers_map = {}  # keyed by uid -> (sort_key, uid, entry)
+        admins_map = {}      # keyed by uid -> (sort_key, uid, entry)
         # NOTE: django_elevated removed - roles come from Firebase only
 
         # 1. Query /users/ collection for 'roles' array field
         # Note: setUserRole() stores roles as array: ["member", "superuser"]
-        superuser_docs = db.collection("users").where("roles", "array_contains", "superuser").stream()
-        for doc in superuser_docs:
+        # A single array_contains_any scan covers both elevated roles
+        elevated_query = db.collection("users").select(ELEVATED_USER_FIELDS).where(
+            "roles", "array_contains_any", ["superuser", "admin"]
+        )
+        if page_size is not None:
+            # Document id breaks ties between equal names, so the cursor
+            # identifies exactly one position
+            elevated_query = elevated_query.order_by("displayNameLower").order_by("__name__")
+            if start_after:
+                elevated_query = elevated_query.start_after({
+                    "displayNameLower": start_after["displayNameLower"],
+                    "__name__": start_after["uid"]
+                })
+            elevated_query = elevated_query.limit(page_size)
+        last_cursor = None
+        doc_count = 0
+        for doc in elevated_query.stream():
             data = doc.to_dict()
-            superusers_map[doc.id] = {
+            display_name_lower = data.get("displayNameLower")
+            last_cursor = {"displayNameLower": display_name_lower, "uid": doc.id}
+            doc_count += 1
+            roles = data.get("roles") or []
+            if "superuser" in roles:
+                target_map = superusers_map
+            elif "admin" in roles:
+                target_map = admins_map
+            else:
+                continue
+            display_name = data.get("displayName") or data.get("fullName") or "Nafnlaus"
+            # Stored as (sort key, uid, entry) so sorting is a plain tuple
+            # compare; uid is unique, so entries themselves are never compared
+            sort_key = display_name_lower or display_name.lower()
+            role_updated_at = data.get("roleUpdatedAt")
+            target_map[doc.id] = (sort_key, doc.id, {
                 "uid": doc.id,
                 "kennitala": data.get("kennitala"),
-                "displayName": data.get("displayName") or data.get("fullName") or "Nafnlaus",
+                "displayName": display_name,
                 "email": data.get("email") or "-",
-                "roleUpdatedAt": data.get("roleUpdatedAt").isoformat() if data.get("roleUpdatedAt") else None,
+                "roleUpdatedAt": role_updated_at.isoformat() if role_updated_at else None,
                 "source": "users",
                 "hasLoggedIn": True
-            }
-
-        admin_docs = db.collection("users").where("roles", "array_contains", "admin").stream()
-        for doc in admin_docs:
-            data = doc.to_dict()
-            if doc.id not in superusers_map:  # Don't downgrade superusers
-                admins_map[doc.id] = {
-                    "uid": doc.id,
-                    "kennitala": data.get("kennitala"),
-                    "displayName": data.get("displayName") or data.get("fullName") or "Nafnlaus",
-                    "email": data.get("email") or "-",
-                    "roleUpdatedAt": data.get("roleUpdatedAt").isoformat() if data.get("roleUpdatedAt") else None,
-                    "source": "users",
-                    "hasLoggedIn": True
-                }
+            })
 
         # 2. Skip Firebase Auth list_users() - it's too slow (iterates ALL users)
         # The /users/ collection query above is sufficient since:
@@ -1199,22 +1673,31 @@ def list_elevated_users_handler(req: https_fn.CallableRequest) -> Dict[str, Any]
         # See: tmp/RFC_RBAC_CLEANUP.md
 
         # Convert to sorted lists
-        superusers = sorted(list(superusers_map.values()), key=lambda x: (x["displayName"] or "").lower())
-        admins = sorted(list(admins_map.values()), key=lambda x: (x["displayName"] or "").lower())
+        superusers = [entry for _, _, entry in sorted(superusers_map.values())]
+        admins = [entry for _, _, entry in sorted(admins_map.values())]
 
         log_json("info", "Listed elevated users",
                 superuser_count=len(superusers),
                 admin_count=len(admins))
 
-        return {
+        response = {
             "superusers": superusers,
             "admins": admins,
             "counts": {
                 "superusers": len(superusers),
                 "admins": len(admins)
-            }
+            },
+            # Cursor for the next page; None when this was the last page
+            "next_cursor": last_cursor if page_size is not None and doc_count == page_size else None
         }
 
+        # Only the full listing is cached; pages depend on their cursor
+        if page_size is None:
+            with _elevated_users_cache_lock:
+                _elevated_users_cache = (time.time(), response)
+
+        return response
+
     except Exception as e:
         log_json("error", "Failed to list elevated users", error=str(e))
         raise https_fn.HttpsError(
@@ -1227,6 +1710,12 @@ def list_elevated_users_handler(req: https_fn.CallableRequest) -> Dict[str, Any]
 # LOGIN AUDIT
 # ==============================================================================
 
+# /users fields read by get_login_audit_handler (projection)
+LOGIN_AUDIT_FIELDS = [
+    "lastLogin", "displayName", "fullName", "email",
+    "loginError", "loginStatus", "authProvider", "lastUserAgent"
+]
+
 def get_login_audit_handler(req: https_fn.CallableRequest) -> Dict[str, Any]:
     """
     Get login history from Firestore /users/ collection.
@@ -1249,53 +1738,69 @@ def get_login_audit_handler(req: https_fn.CallableRequest) -> Dict[str, Any]:
     user_filter = (data.get("user_filter") or "").lower()
     result_limit = min(data.get("limit", 100), 500)
 
-    db = firestore.client()
+    db = get_db()
 
     try:
-        from datetime import datetime, timedelta, timezone
         cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
 
-        # Query users with recent login activity
-        query = db.collection("users").order_by("lastLogin", direction=firestore.Query.DESCENDING).limit(result_limit)
+        # Query users with login activity inside the window, so the limit
+        # applies to matching users rather than to all users
+        query = db.collection("users").select(LOGIN_AUDIT_FIELDS).where(
+            "lastLogin", ">=", cutoff
+        )
+        if status_filter == "failed":
+            # Served by the (lastLogin, loginError) composite index
+            query = query.where("loginError", "!=", None)
+        elif status_filter == "success":
+            # loginStatus is written with lastLogin on every login; served by
+            # the (loginStatus, lastLogin) composite index
+            query = query.where("loginStatus", "==", "success")
+        query = query.order_by(
+            "lastLogin", direction=firestore.Query.DESCENDING
+        ).limit(result_limit)
 
         results = []
+        success_count = 0
+        failed_count = 0
         for doc in query.stream():
             user_data = doc.to_dict()
             last_login = user_data.get("lastLogin")
-
-            # Skip if before cutoff
-            if last_login and last_login < cutoff:
-                continue
+            display_name = user_data.get("displayName")
+            email = user_data.get("email")
+            login_error = user_data.get("loginError")
+            login_status = user_data.get("loginStatus")
 
             # Apply user filter
             if user_filter:
-                name = (user_data.get("displayName") or "").lower()
-                email = (user_data.get("email") or "").lower()
-                if user_filter not in name and user_filter not in email:
+                if (user_filter not in (display_name or "").lower()
+                        and user_filter not in (email or "").lower()):
                     continue
 
-            # Determine login status (based on loginError field)
-            login_status = "failed" if user_data.get("loginError") else "success"
+            # Documents written before loginStatus existed fall back to
+            # the loginError field
+            if not login_status:
+                login_status = "failed" if login_error else "success"
 
-            # Apply status filter
+            # The query already filters on status; a stale loginError on a
+            # user whose latest login succeeded still has to be dropped
             if status_filter and login_status != status_filter:
                 continue
 
+            if login_status == "failed":
+                failed_count += 1
+            else:
+                success_count += 1
             results.append({
                 "uid": doc.id,
-                "user": user_data.get("displayName") or user_data.get("fullName"),
-                "email": user_data.get("email"),
+                "user": display_name or user_data.get("fullName"),
+                "email": email,
                 "status": login_status,
                 "timestamp": last_login.isoformat() if last_login else None,
                 "method": user_data.get("authProvider", "kenni.is"),
                 "userAgent": user_data.get("lastUserAgent"),
-                "error": user_data.get("loginError")
+                "error": login_error
             })
 
-        # Calculate stats
-        success_count = sum(1 for r in results if r["status"] == "success")
-        failed_count = sum(1 for r in results if r["status"] == "failed")
-
         return {
             "logins": results,
             "stats": {
@@ -1340,9 +1845,11 @@ def get_deleted_counts_handler(req: https_fn.CallableRequest) -> Dict[str, Any]:
         # Count votes with deletedAt != null (if votes collection exists)
         deleted_votes = 0
         try:
-            db = firestore.client()
+            db = get_db()
             votes_query = db.collection("votes").where("deletedAt", "!=", None)
-            deleted_votes = len(list(votes_query.stream()))
+            # Server-side count aggregation - no documents are downloaded
+            count_result = votes_query.count().get()
+            deleted_votes = int(count_result[0][0].value)
         except Exception:
             pass  # votes collection might not exist
 
@@ -1363,6 +1870,95 @@ def get_deleted_counts_handler(req: https_fn.CallableRequest) -> Dict[str, Any]:
         )
 
 
+# Concurrent Cloud SQL batch purges in purgedeleted
+PURGE_MAX_WORKERS = 8
+
+# Maximum number of values in a Firestore `in` filter
+FIRESTORE_IN_QUERY_LIMIT = 30
+
+# Attempts per BulkWriter write before it is reported as failed
+BULK_WRITER_MAX_ATTEMPTS = 5
+
+# Retries for Firebase Auth calls that hit the Identity Platform quota
+AUTH_MAX_RETRIES = 4
+
+# Members per purge batch (must not exceed the 1000-UID auth.delete_users() limit)
+PURGE_BATCH_SIZE = 100
+
+# Purges are limited to one per caller per hour (the Firestore sliding
+# window is authoritative). This instance also remembers when it let a
+# caller through, so repeat clicks are refused without a Firestore round-trip.
+PURGE_WINDOW_SECONDS = 3600
+_purge_allowed_at: Dict[str, float] = {}
+_purge_allowed_at_lock = threading.Lock()
+
+
+def _delete_auth_users_with_backoff(uids: List[str]) -> auth.DeleteUsersResult:
+    """Bulk-delete Firebase Auth users, backing off exponentially on quota errors."""
+    for attempt in range(AUTH_MAX_RETRIES):
+        try:
+            return auth.delete_users(uids)
+        except firebase_exceptions.ResourceExhaustedError:
+            if attempt == AUTH_MAX_RETRIES - 1:
+                raise
+            time.sleep(0.5 * (2 ** attempt))
+
+
+def _find_uids_by_kennitala(db, kennitalas: List[str]) -> Dict[str, str]:
+    """
+    Map kennitala -> Firebase UID via /users, using batched `in` queries.
+
+    Firestore allows up to 30 values per `in` filter, so chunks of 30
+    are looked up concurrently.
+    """
+    chunks = [
+        kennitalas[i:i + FIRESTORE_IN_QUERY_LIMIT]
+        for i in range(0, len(kennitalas), FIRESTORE_IN_QUERY_LIMIT)
+    ]
+
+    def lookup(chunk):
+        # Only the kennitala field is read back; skip the rest of the document
+        query = db.collection("users").select(["kennitala"]).where("kennitala", "in", chunk)
+        return [(doc.get("kennitala"), doc.id) for doc in query.stream()]
+
+    uid_by_kennitala = {}
+    with ThreadPoolExecutor(max_workers=PURGE_MAX_WORKERS) as executor:
+        for pairs in executor.map(lookup, chunks):
+            for kennitala, uid in pairs:
+                uid_by_kennitala.setdefault(kennitala, uid)
+    return uid_by_kennitala
+
+
+def _purge_batch(batch: List[Dict[str, Any]]) -> List[Tuple[bool, str, Optional[str]]]:
+    """
+    Permanently delete a batch of soft-deleted members from Cloud SQL.
+
+    The whole batch is deleted in one transaction, falling back to one
+    member at a time if that fails, so errors are reported per member.
+    Firebase Auth users and /users documents are removed in bulk by
+    purgedeleted itself.
+
+    Returns:
+        One (success, member_name, error message or None) per member
+    """
+    try:
+        sql_results = hard_delete_members_sql([m["id"] for m in batch])
+    except Exception as e:
+        log_json("warning", "Failed to purge member batch",
+                 error=str(e), count=len(batch))
+        return [(False, m.get("name", "Unknown"), str(e)) for m in batch]
+
+    outcomes = []
+    for member in batch:
+        member_name = member.get("name", "Unknown")
+        sql_result = sql_results[int(member["id"])]
+        if sql_result["success"]:
+            outcomes.append((True, member_name, None))
+        else:
+            outcomes.append((False, member_name, str(sql_result.get("errors", ["Unknown error"]))))
+    return outcomes
+
+
 @https_fn.on_call(region="europe-west2")
 def purgedeleted(req: https_fn.CallableRequest) -> Dict[str, Any]:
     """
@@ -1381,93 +1977,124 @@ def purgedeleted(req: https_fn.CallableRequest) -> Dict[str, Any]:
     caller_uid = req.auth.uid
 
     # Security: Rate limit bulk purge operations (1 per hour)
-    if not check_uid_rate_limit(caller_uid, "purge_deleted", max_attempts=1, window_minutes=60):
+    with _purge_allowed_at_lock:
+        allowed_at = _purge_allowed_at.get(caller_uid)
+    elapsed = time.time() - allowed_at if allowed_at is not None else None
+    if elapsed is not None and elapsed < PURGE_WINDOW_SECONDS:
+        allowed, retry_after = False, max(1, math.ceil(PURGE_WINDOW_SECONDS - elapsed))
+    else:
+        allowed, retry_after = check_uid_rate_limit_with_retry(
+            caller_uid, "purge_deleted", max_attempts=1, window_minutes=PURGE_WINDOW_SECONDS // 60
+        )
+        if allowed:
+            with _purge_allowed_at_lock:
+                _purge_allowed_at[caller_uid] = time.time()
+    if not allowed:
         raise https_fn.HttpsError(
             code=https_fn.FunctionsErrorCode.RESOURCE_EXHAUSTED,
-            message="Rate limit exceeded. Maximum 1 purge per hour."
+            message="Rate limit exceeded. Maximum 1 purge per hour.",
+            details={"retry_after_seconds": retry_after}
         )
 
-    try:
-        db = firestore.client()
+    with destructive_operation_slot(caller_uid):
+        try:
+            db = get_db()
 
-        # 1. Get all soft-deleted members from Cloud SQL (source of truth)
-        deleted_members = get_deleted_members(limit=1000)  # Get up to 1000
+            deleted_count = 0
+            total_members = 0
+            errors = []
 
-        if not deleted_members:
-            return {
-                "success": True,
-                "count": 0,
-                "message": "No soft-deleted members to purge."
-            }
-
-        deleted_count = 0
-        errors = []
+            # Queue /users deletes on a BulkWriter, which batches and retries
+            # them in the background while the Auth/SQL purges run
+            def on_write_error(failure, _writer) -> bool:
+                if failure.attempts < BULK_WRITER_MAX_ATTEMPTS:
+                    return True
+                errors.append(f"/users/{failure.operation.reference.id}: {failure.message}")
+                return False
 
-        # 2. Process each soft-deleted member
-        for member in deleted_members:
-            member_id = member.get("id")
-            kennitala = member.get("kennitala")
-            member_name = member.get("name", "Unknown")
+            bulk_writer = db.bulk_writer()
+            bulk_writer.on_write_error(on_write_error)
 
             try:
-                # 2a. Find Firebase UID by kennitala
-                firebase_uid = None
-                if kennitala:
-                    users_query = db.collection("users").where(
-                        "kennitala", "==", kennitala
-                    ).limit(1).stream()
-                    for user_doc in users_query:
-                        firebase_uid = user_doc.id
-                        break
-
-                # 2b. Delete Firebase Auth user
-                if firebase_uid:
-                    try:
-                        auth.delete_user(firebase_uid)
-                    except auth.UserNotFoundError:
-                        pass  # Already deleted
-                    except Exception as e:
-                        log_json("warning", "Could not delete Firebase Auth",
-                                 error=str(e), member_id=member_id)
-
-                    # 2c. Delete Firestore /users document
-                    try:
-                        db.collection("users").document(firebase_uid).delete()
-                    except Exception as e:
-                        log_json("warning", "Could not delete /users doc",
-                                 error=str(e), member_id=member_id)
-
-                # 2d. Delete from Cloud SQL (source of truth)
-                sql_result = hard_delete_member_sql(int(member_id))
-                if sql_result["success"]:
-                    deleted_count += 1
-                else:
-                    errors.append(f"{member_name}: {sql_result.get('errors', ['Unknown error'])}")
-
-            except Exception as e:
-                errors.append(f"{member_name}: {str(e)}")
-                log_json("warning", "Failed to purge member",
-                         error=str(e), member_id=member_id)
-
-        # 3. Log the bulk operation
-        log_json("warning", "DANGEROUS: Bulk purge of deleted members",
-                 action="purge_deleted",
-                 caller_uid=caller_uid,
-                 deleted_count=deleted_count,
-                 error_count=len(errors))
+                # Each batch is purged from Cloud SQL in one transaction on a
+                # worker thread, so it overlaps with fetching the next batch.
+                with ThreadPoolExecutor(max_workers=PURGE_MAX_WORKERS) as executor:
+                    futures = []
+
+                    # 1. Stream soft-deleted members from Cloud SQL (source of truth)
+                    # in batches; each batch starts purging while the next is fetched
+                    for batch in iter_deleted_members(limit=1000, batch_size=PURGE_BATCH_SIZE,
+                                                      include_kennitala=True):
+                        total_members += len(batch)
+
+                        # 2. Resolve Firebase UIDs for the batch: use the UID stored
+                        # in Cloud SQL, and only look up the rest by kennitala
+                        uids = {m["firebase_uid"] for m in batch if m.get("firebase_uid")}
+                        kennitalas = list({
+                            m["kennitala"] for m in batch
+                            if not m.get("firebase_uid") and m.get("kennitala")
+                        })
+                        if kennitalas:
+                            uids.update(_find_uids_by_kennitala(db, kennitalas).values())
+                        uids = list(uids)
+
+                        # 3. Queue /users deletes
+                        for firebase_uid in uids:
+                            bulk_writer.delete(db.collection("users").document(firebase_uid))
+
+                        # 4. Delete Firebase Auth users in bulk (one call per batch).
+                        # Users that no longer exist are treated as deleted by the API.
+                        if uids:
+                            try:
+                                result = _delete_auth_users_with_backoff(uids)
+                                for error_info in result.errors:
+                                    errors.append(f"Firebase Auth {uids[error_info.index]}: {error_info.reason}")
+                            except Exception as e:
+                                log_json("warning", "Could not delete Firebase Auth users",
+                                         error=str(e), count=len(uids))
+                                errors.append(f"Firebase Auth: {str(e)}")
+
+                        # 5. Purge Cloud SQL records
+                        futures.append(executor.submit(_purge_batch, batch))
+
+                    for future in as_completed(futures):
+                        for ok, member_name, error in future.result():
+                            if ok:
+                                deleted_count += 1
+                            else:
+                                errors.append(f"{member_name}: {error}")
+            finally:
+                # Flush queued /users deletes even if a batch failed, so
+                # members already removed from Auth don't keep their docs
+                bulk_writer.close()
+                _invalidate_elevated_users_cache()
+
+            if total_members == 0:
+                return {
+                    "success": True,
+                    "count": 0,
+                    "message": "No soft-deleted members to purge."
+                }
 
-        return {
-            "success": len(errors) == 0,
-            "count": deleted_count,
-            "errors": errors if errors else None,
-            "message": f"Permanently deleted {deleted_count} members." + (
-                f" {len(errors)} errors occurred." if errors else ""
-            )
-        }
+            # 6. Log the bulk operation
+            log_json("warning", "DANGEROUS: Bulk purge of deleted members",
+                     action="purge_deleted",
+                     caller_uid=caller_uid,
+                     deleted_count=deleted_count,
+                     error_count=len(errors))
 
-    except Exception as e:
-        log_json("error", "Failed to purge deleted members", error=str(e))
-        raise https_fn.HttpsError(
-            code=https_fn.FunctionsErrorCode.INTERNAL,
-            message=f"Failed to purge deleted members: {str(e)}"
-        )
+            return {
+                "success": len(errors) == 0,
+                "count": deleted_count,
+                "errors": errors if errors else None,
+                "message": f"Permanently deleted {deleted_count} members." + (
+                    f" {len(errors)} errors occurred." if errors else ""
+                )
+            }
+
+        except Exception as e:
+            log_json("error", "Failed to purge deleted members", error=str(e))
+            raise https_fn.HttpsError(
+                code=https_fn.FunctionsErrorCode.INTERNAL,
+                message=f"Failed to purge deleted members: {str(e)}"
+            )
@@ -1,11 +1,14 @@
 """
 Rate limiting utilities for Ekklesia Members Service
 
-Handles IP-based rate limiting with Firestore.
+Handles IP- and UID-based rate limiting, and per-user concurrency
+limits, with Firestore.
 """
 
+import math
+import uuid
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from firebase_admin import firestore
 from google.cloud import firestore as gcf
@@ -39,6 +42,115 @@ def rate_limit_bucket_id(ip_address: str, now: datetime, window_minutes: int) ->
     return f"{ip_address}:{bucket}:{window_minutes}m"
 
 
+def uid_rate_limit_bucket_id(uid: str, action: str, now: datetime, window_minutes: int) -> str:
+    """
+    Create the fixed-window document id for check_uid_rate_limit.
+
+    Like rate_limit_bucket_id, the id encodes the time bucket, so old
+    buckets are simply never read again.
+
+    Args:
+        uid: User UID (Firebase Auth)
+        action: Action name
+        now: Current datetime
+        window_minutes: Time window in minutes
+
+    Returns:
+        Document ID for the rate limit bucket
+    """
+    bucket = int(now.timestamp()) // (window_minutes * 60)
+    return f"{uid}:{action}:{bucket}:{window_minutes}m"
+
+
+def sliding_window_attempt(attempts: List[float], now_ts: float, max_attempts: int,
+                           window_seconds: int) -> Tuple[bool, int, List[float]]:
+    """
+    Decide one attempt against a sliding-window log of attempt timestamps.
+
+    Attempts exactly window_seconds old have slid out of the window.
+
+    Args:
+        attempts: Previous attempt timestamps (epoch seconds)
+        now_ts: Current time (epoch seconds)
+        max_attempts: Maximum allowed attempts in the window
+        window_seconds: Window length in seconds
+
+    Returns:
+        (allowed, retry_after_seconds, attempts to store). retry_after_seconds
+        is the time until the oldest attempt slides out (0 when allowed); the
+        returned log has expired entries dropped and, when allowed, now_ts
+        appended, so it never holds more than max_attempts entries.
+    """
+    window_start = now_ts - window_seconds
+    live = [t for t in attempts if t > window_start]
+    if len(live) >= max_attempts:
+        return False, max(1, math.ceil(min(live) - window_start)), live
+    live.append(now_ts)
+    return True, 0, live
+
+
+def check_uid_rate_limit_with_retry(uid: Optional[str], action: str, max_attempts: int = 3, window_minutes: int = 60) -> Tuple[bool, int]:
+    """
+    Transactional sliding-window UID-based rate limit for superuser operations.
+
+    Keeps a log of attempt timestamps in one document per (uid, action, window)
+    and checks-and-appends inside a single Firestore transaction, so concurrent
+    calls on different instances cannot both take the last slot. Unlike a fixed
+    time bucket, the window slides: a burst at a bucket boundary cannot get
+    2x max_attempts through, and the caller can be told when to retry.
+
+    Every call reads and rewrites the same document, so this is meant for
+    low-volume destructive actions (the superuser handlers). High-volume
+    callers should use check_uid_rate_limit, which keeps fixed buckets.
+
+    Args:
+        uid: User UID (Firebase Auth)
+        action: Action name (e.g., 'hard_delete', 'anonymize')
+        max_attempts: Maximum allowed attempts in time window (default 3)
+        window_minutes: Time window in minutes (default 60)
+
+    Returns:
+        (allowed, retry_after_seconds). retry_after_seconds is the time until
+        the oldest attempt slides out of the window (0 when allowed).
+    """
+    if not uid:
+        log_json("warn", "Missing UID for rate limiting; denying request")
+        return False, 0
+
+    db = firestore.client()
+    now = datetime.now(timezone.utc)
+    now_ts = now.timestamp()
+    doc_id = f"{uid}:{action}:{window_minutes}m"
+    ref = db.collection('rate_limits').document(doc_id)
+    expires_at = now + timedelta(minutes=window_minutes)
+
+    @gcf.transactional
+    def _attempt(transaction) -> Tuple[bool, int]:
+        snapshot = ref.get(transaction=transaction)
+        data = (snapshot.to_dict() or {}) if snapshot.exists else {}
+        allowed, retry_after, attempts = sliding_window_attempt(
+            data.get('attempts', []), now_ts, max_attempts, window_minutes * 60
+        )
+        if not allowed:
+            return False, retry_after
+        transaction.set(ref, {
+            'attempts': attempts,
+            'count': len(attempts),
+            'updatedAt': firestore.SERVER_TIMESTAMP,
+            'windowMinutes': window_minutes,
+            'expiresAt': expires_at,
+            'uid': uid,
+            'action': action,
+        })
+        return True, 0
+
+    allowed, retry_after = _attempt(db.transaction())
+    if not allowed:
+        log_json("warn", "UID rate limit exceeded", uid=uid, action=action, windowMinutes=window_minutes,
+                 maxAttempts=max_attempts, retryAfterSeconds=retry_after)
+    return allowed, retry_after
+
+
 def check_uid_rate_limit(uid: Optional[str], action: str, max_attempts: int = 3, window_minutes: int = 60) -> bool:
     """
     Transactional UID-based rate limit for dangerous operations.
@@ -62,8 +174,7 @@ def check_uid_rate_limit(uid: Optional[str], action: str, max_attempts: int = 3,
     db = firestore.client()
     now = datetime.now(timezone.utc)
     # Bucket by uid + action + time window
-    bucket = int(now.timestamp()) // (window_minutes * 60)
-    doc_id = f"{uid}:{action}:{bucket}:{window_minutes}m"
+    doc_id = uid_rate_limit_bucket_id(uid, action, now, window_minutes)
     ref = db.collection('rate_limits').document(doc_id)
     expires_at = now + timedelta(minutes=window_minutes)
 
@@ -161,3 +272,62 @@ def check_rate_limit(ip_address: Optional[str], max_attempts: int = 5, window_mi
     if not allowed:
         log_json("warn", "Rate limit exceeded", ip=ip_address, windowMinutes=window_minutes, maxAttempts=max_attempts)
     return allowed
+
+
+def acquire_concurrency_slot(uid: str, action: str, max_concurrent: int = 1, lease_seconds: int = 300) -> Optional[str]:
+    """
+    Transactionally claim one of `max_concurrent` in-flight slots for (uid, action).
+
+    Each slot is a lease that expires after `lease_seconds`, so a crashed
+    instance that never releases its slot cannot lock the user out for good.
+
+    Args:
+        uid: User UID (Firebase Auth)
+        action: Action group name (e.g., 'superuser_destructive')
+        max_concurrent: Maximum in-flight requests per uid
+        lease_seconds: Slot lifetime if never released (should exceed the function timeout)
+
+    Returns:
+        Slot id to pass to release_concurrency_slot(), or None if all slots are taken.
+    """
+    db = firestore.client()
+    now = datetime.now(timezone.utc)
+    now_ts = now.timestamp()
+    slot_id = uuid.uuid4().hex
+    ref = db.collection('concurrency_slots').document(f"{uid}:{action}")
+
+    @gcf.transactional
+    def _acquire(transaction) -> bool:
+        snapshot = ref.get(transaction=transaction)
+        data = (snapshot.to_dict() or {}) if snapshot.exists else {}
+        # Drop leases that expired without being released
+        slots = {k: v for k, v in (data.get('slots') or {}).items() if v > now_ts}
+        if len(slots) >= max_concurrent:
+            return False
+        slots[slot_id] = now_ts + lease_seconds
+        transaction.set(ref, {
+            'slots': slots,
+            'updatedAt': firestore.SERVER_TIMESTAMP,
+            'expiresAt': now + timedelta(seconds=lease_seconds),
+            'uid': uid,
+            'action': action,
+        })
+        return True
+
+    if not _acquire(db.transaction()):
+        log_json("warn", "Concurrent request limit exceeded", uid=uid, action=action, maxConcurrent=max_concurrent)
+        return None
+    return slot_id
+
+
+def release_concurrency_slot(uid: str, action: str, slot_id: str) -> None:
+    """Release a slot claimed with acquire_concurrency_slot(). Never raises."""
+    try:
+        db = firestore.client()
+        db.collection('concurrency_slots').document(f"{uid}:{action}").update({
+            f'slots.{slot_id}': firestore.DELETE_FIELD,
+            'updatedAt': firestore.SERVER_TIMESTAMP,
+        })
+    except Exception as e:
+        # The lease expires on its own; just record the failure
+        log_json("warn", "Failed to release concurrency slot", uid=uid, action=action, error=str(e))
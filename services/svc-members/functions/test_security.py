@@ -25,6 +25,8 @@ except ImportError:
     sys.path.insert(0, os.path.dirname(__file__))
     from util_security import _rate_limit_bucket_id, validate_auth_input
 
+from shared.rate_limit import sliding_window_attempt, uid_rate_limit_bucket_id
+
 
 def test_rate_limit_bucket_id() -> None:
     """Verify time-bucketed document IDs are correct and change across buckets."""
@@ -43,6 +45,63 @@ def test_rate_limit_bucket_id() -> None:
     assert doc_id != doc_id_later
 
 
+def test_uid_rate_limit_bucket_id() -> None:
+    """Verify fixed-window UID bucket IDs keep their format and roll over."""
+    now = datetime(2025, 10, 16, 12, 0, 0, tzinfo=timezone.utc)
+    doc_id = uid_rate_limit_bucket_id("uid1", "send_email", now, 1)
+
+    parts = doc_id.split(':')
+    assert parts[:2] == ["uid1", "send_email"]
+    assert parts[2].isdigit()
+    assert parts[3] == "1m"
+
+    # Same bucket within the window, new bucket after it
+    assert uid_rate_limit_bucket_id("uid1", "send_email", datetime(2025, 10, 16, 12, 0, 59, tzinfo=timezone.utc), 1) == doc_id
+    assert uid_rate_limit_bucket_id("uid1", "send_email", datetime(2025, 10, 16, 12, 1, 0, tzinfo=timezone.utc), 1) != doc_id
+
+
+def test_sliding_window_prunes_expired_attempts() -> None:
+    """Attempts older than the window are dropped before counting."""
+    allowed, retry_after, attempts = sliding_window_attempt([0.0, 50.0], 120.0, 2, 100)
+    assert allowed is True
+    assert retry_after == 0
+    assert attempts == [50.0, 120.0]
+
+
+def test_sliding_window_boundary() -> None:
+    """An attempt exactly one window old no longer counts; a younger one does."""
+    allowed, _, attempts = sliding_window_attempt([20.0], 120.0, 1, 100)
+    assert allowed is True
+    assert attempts == [120.0]
+
+    allowed, _, attempts = sliding_window_attempt([20.5], 120.0, 1, 100)
+    assert allowed is False
+    assert attempts == [20.5]
+
+
+def test_sliding_window_retry_after() -> None:
+    """retry_after is the time until the oldest live attempt slides out."""
+    allowed, retry_after, attempts = sliding_window_attempt([30.0, 60.0], 100.0, 2, 100)
+    assert allowed is False
+    assert retry_after == 30
+    assert attempts == [30.0, 60.0]  # Denied attempts are not recorded
+
+    # Rounded up, and never 0 while limited
+    _, retry_after, _ = sliding_window_attempt([0.2], 100.0, 1, 100)
+    assert retry_after == 1
+
+
+def test_sliding_window_log_is_bounded() -> None:
+    """The stored log never grows past max_attempts."""
+    attempts = []
+    allowed_count = 0
+    for i in range(10):
+        allowed, _, attempts = sliding_window_attempt(attempts, 1000.0 + i, 3, 60)
+        allowed_count += allowed
+        assert len(attempts) <= 3
+    assert allowed_count == 3
+
+
 essential_valid = [
     ("abc", "xyz"),
     ("test_code", "test_verifier"),
@@ -79,6 +138,11 @@ def test_validate_auth_input_missing() -> None:
 
 if __name__ == "__main__":
     test_rate_limit_bucket_id()
+    test_uid_rate_limit_bucket_id()
+    test_sliding_window_prunes_expired_attempts()
+    test_sliding_window_boundary()
+    test_sliding_window_retry_after()
+    test_sliding_window_log_is_bounded()
     test_validate_auth_input_valid()
     test_validate_auth_input_too_long()
     test_validate_auth_input_missing()
@@ -0,0 +1,82 @@
+#!/usr/bin/env node
+/**
+ * Backfill: Add 'displayNameLower' to /users/ documents
+ *
+ * Background: listElevatedUsers pages are ordered server-side on
+ * 'displayNameLower' (lowercased displayName, falling back to fullName).
+ * Firestore leaves documents without the field out of ordered queries.
+ * Logins and setUserRole write the field from now on; this script fills in
+ * existing users. Users with roles but no name get '' so they still sort.
+ *
+ * This script:
+ * 1. Reads all users
+ * 2. Sets 'displayNameLower' where it is missing or out of date
+ * 3. Logs the changes
+ *
+ * Run from: services/svc-elections (has firebase-admin installed)
+ * Usage: node ../svc-members/scripts/backfill-display-name-lower.js [--dry-run]
+ */
+
+const admin = require('firebase-admin');
+
+// Initialize Firebase
+admin.initializeApp({
+  projectId: 'ekklesia-prod-10-2025'
+});
+
+const db = admin.firestore();
+const dryRun = process.argv.includes('--dry-run');
+
+async function backfill() {
+  console.log(`\n=== Backfill: displayNameLower ===`);
+  console.log(`Mode: ${dryRun ? 'DRY RUN (no changes)' : 'LIVE'}\n`);
+
+  const usersRef = db.collection('users');
+  const snapshot = await usersRef.select('displayName', 'fullName', 'displayNameLower', 'roles').get();
+
+  let total = 0;
+  let needsUpdate = 0;
+  let updated = 0;
+  const writer = db.bulkWriter();
+
+  for (const doc of snapshot.docs) {
+    total++;
+    const data = doc.data();
+    const name = data.displayName || data.fullName;
+    if (!name && !(data.roles && data.displayNameLower === undefined)) {
+      continue;
+    }
+
+    const displayNameLower = (name || '').toLowerCase();
+    if (data.displayNameLower === displayNameLower) {
+      continue;
+    }
+
+    needsUpdate++;
+    console.log(`[${doc.id}] ${name} -> "${displayNameLower}"`);
+
+    if (!dryRun) {
+      writer.update(doc.ref, { displayNameLower })
+        .then(() => updated++)
+        .catch(err => console.error(`  -> FAILED ${doc.id}: ${err.message}`));
+    }
+  }
+
+  await writer.close();
+
+  console.log(`\n=== Summary ===`);
+  console.log(`Total users: ${total}`);
+  console.log(`Needing displayNameLower: ${needsUpdate}`);
+  console.log(`Updated: ${updated}`);
+
+  if (dryRun && needsUpdate > 0) {
+    console.log(`\nRun without --dry-run to apply changes.`);
+  }
+
+  process.exit(0);
+}
+
+backfill().catch(err => {
+  console.error('Backfill failed:', err);
+  process.exit(1);
+});
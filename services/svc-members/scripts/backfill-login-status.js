@@ -0,0 +1,77 @@
+#!/usr/bin/env node
+/**
+ * Backfill: Add 'loginStatus' to /users/ documents
+ *
+ * Background: getLoginAudit filters successful logins server-side with
+ * loginStatus == 'success'. Users whose last login predates the field are
+ * left out of that filter. Logins write the field from now on; this script
+ * fills in existing users ('failed' if loginError is set, else 'success').
+ *
+ * This script:
+ * 1. Reads all users that have logged in
+ * 2. Sets 'loginStatus' where it is missing
+ * 3. Logs the changes
+ *
+ * Run from: services/svc-elections (has firebase-admin installed)
+ * Usage: node ../svc-members/scripts/backfill-login-status.js [--dry-run]
+ */
+
+const admin = require('firebase-admin');
+
+// Initialize Firebase
+admin.initializeApp({
+  projectId: 'ekklesia-prod-10-2025'
+});
+
+const db = admin.firestore();
+const dryRun = process.argv.includes('--dry-run');
+
+async function backfill() {
+  console.log(`\n=== Backfill: loginStatus ===`);
+  console.log(`Mode: ${dryRun ? 'DRY RUN (no changes)' : 'LIVE'}\n`);
+
+  const usersRef = db.collection('users');
+  const snapshot = await usersRef.select('lastLogin', 'loginError', 'loginStatus').get();
+
+  let total = 0;
+  let needsUpdate = 0;
+  let updated = 0;
+  const writer = db.bulkWriter();
+
+  for (const doc of snapshot.docs) {
+    total++;
+    const data = doc.data();
+    if (!data.lastLogin || data.loginStatus) {
+      continue;
+    }
+
+    const loginStatus = data.loginError ? 'failed' : 'success';
+
+    needsUpdate++;
+    console.log(`[${doc.id}] -> "${loginStatus}"`);
+
+    if (!dryRun) {
+      writer.update(doc.ref, { loginStatus })
+        .then(() => updated++)
+        .catch(err => console.error(`  -> FAILED ${doc.id}: ${err.message}`));
+    }
+  }
+
+  await writer.close();
+
+  console.log(`\n=== Summary ===`);
+  console.log(`Total users: ${total}`);
+  console.log(`Needing loginStatus: ${needsUpdate}`);
+  console.log(`Updated: ${updated}`);
+
+  if (dryRun && needsUpdate > 0) {
+    console.log(`\nRun without --dry-run to apply changes.`);
+  }
+
+  process.exit(0);
+}
+
+backfill().catch(err => {
+  console.error('Backfill failed:', err);
+  process.exit(1);
+});